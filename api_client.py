@@ -0,0 +1,263 @@
+"""
+AIGEM2 API Client
+Process-wide pooled HTTP client with retries, a circuit breaker and latency metrics
+"""
+import atexit
+import random
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Optional, Any
+from urllib.parse import urlsplit
+
+CONNECT_TIMEOUT = 3.0
+DEFAULT_TIMEOUT = 10.0
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.3
+BACKOFF_MAX = 3.0
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30.0
+
+METRICS_CAPACITY = 500
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ApiUnavailableError(ConnectionError):
+    """Server marked unreachable by the circuit breaker (offline mode)"""
+
+
+class CircuitBreaker:
+    """Stop calling a host after repeated failures, probe again after a cooldown"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may go out now (one probe at a time when half-open)"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.threshold or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+
+
+class ApiClient:
+    """Keep-alive connection pool shared by every server call"""
+
+    def __init__(self, max_retries: int = MAX_RETRIES):
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._client = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics = deque(maxlen=METRICS_CAPACITY)
+
+    def _get_client(self):
+        """httpx.Client, created on first request so startup doesn't import httpx"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+
+                    try:
+                        import h2  # noqa: F401
+                        http2 = True
+                    except ImportError:
+                        http2 = False
+
+                    self._client = httpx.Client(
+                        http2=http2,
+                        timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+                        limits=httpx.Limits(
+                            max_connections=10,
+                            max_keepalive_connections=5,
+                            keepalive_expiry=30.0
+                        ),
+                        headers={"User-Agent": "AIGEM2"}
+                    )
+        return self._client
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Circuit breaker for the URL's host"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs):
+        """Send a request with pooling, retries and the circuit breaker
+
+        Connection failures are always retried (nothing reached the server).
+        Timeouts and 429/5xx responses are retried only for idempotent calls.
+        Raises ApiUnavailableError while the host's breaker is open. Any other
+        exception still counts as a failure, so a half-open probe is never
+        left outstanding.
+        """
+        import httpx
+
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self._record(method, url, None, 0.0, 0, "circuit_open")
+            raise ApiUnavailableError(f"{urlsplit(url).netloc} is unreachable (offline mode)")
+
+        attempt = 0
+        start = time.perf_counter()
+        outcome_recorded = False
+
+        try:
+            client = self._get_client()
+            while True:
+                try:
+                    response = client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    retryable = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)) or idempotent
+                    if retryable and attempt < self.max_retries:
+                        attempt += 1
+                        self._backoff(attempt)
+                        continue
+                    breaker.record_failure()
+                    outcome_recorded = True
+                    self._record(method, url, None, time.perf_counter() - start, attempt, type(e).__name__)
+                    raise
+
+                if response.status_code in RETRY_STATUSES and idempotent and attempt < self.max_retries:
+                    attempt += 1
+                    self._backoff(attempt, response.headers.get("retry-after"))
+                    continue
+
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                outcome_recorded = True
+                self._record(method, url, response.status_code, time.perf_counter() - start, attempt)
+                return response
+        except BaseException as e:
+            # TooManyRedirects, DecodingError, InvalidURL, KeyboardInterrupt...
+            if not outcome_recorded:
+                breaker.record_failure()
+                self._record(method, url, None, time.perf_counter() - start, attempt, type(e).__name__)
+            raise
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None):
+        """Sleep with full jitter (or the server's Retry-After, capped)"""
+        if retry_after and retry_after.isdigit():
+            delay = min(float(retry_after), BACKOFF_MAX)
+        else:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        time.sleep(delay)
+
+    def _record(self, method: str, url: str, status: Optional[int], elapsed: float,
+                retries: int, error: Optional[str] = None):
+        with self._lock:
+            self._metrics.append({
+                "method": method,
+                "path": urlsplit(url).path,
+                "status": status,
+                "ms": round(elapsed * 1000, 2),
+                "retries": retries,
+                "error": error,
+                "timestamp": time.time()
+            })
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Recent requests, oldest first"""
+        with self._lock:
+            return list(self._metrics)
+
+    def metrics_summary(self) -> List[Dict[str, Any]]:
+        """Count, latency and error rate per endpoint"""
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for sample in self.metrics():
+            groups.setdefault((sample["method"], sample["path"]), []).append(sample)
+
+        rows = []
+        for (method, path), samples in sorted(groups.items()):
+            latencies = sorted(s["ms"] for s in samples)
+            rows.append({
+                "method": method,
+                "path": path,
+                "count": len(samples),
+                "mean_ms": round(sum(latencies) / len(latencies), 2),
+                "p95_ms": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+                "retries": sum(s["retries"] for s in samples),
+                "errors": sum(1 for s in samples if s["error"] or (s["status"] or 0) >= 500)
+            })
+        return rows
+
+    def breaker_states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.state for host, breaker in breakers.items()}
+
+    def close(self):
+        """Close pooled connections"""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+_client: Optional[ApiClient] = None
+_client_lock = threading.Lock()
+
+
+def get_api_client() -> ApiClient:
+    """Process-wide API client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ApiClient()
+                atexit.register(_client.close)
+    return _client
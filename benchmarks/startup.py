@@ -0,0 +1,146 @@
+"""
+Startup Benchmark
+Measures cold import time and time-to-first-render against startup_budget.json
+
+Usage:
+    python benchmarks/startup.py            # fail (exit 1) if over budget
+    python benchmarks/startup.py --update   # rewrite the budget from this machine (+50% headroom)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+BUDGET_FILE = Path(__file__).parent / "startup_budget.json"
+HEADROOM = 1.5
+
+IMPORT_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({script!r}, default_timeout=60)
+app.run()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "exceptions": [str(e.value) for e in app.exception]}}))
+"""
+
+
+def _run_snippet(code: str, home: str) -> dict:
+    """Run a snippet in a fresh interpreter with an isolated HOME"""
+    env = dict(os.environ)
+    env["HOME"] = home
+    env["USERPROFILE"] = home
+    # Fail fast instead of waiting on the network for the pricing config
+    env.setdefault("AIGEM2_API_URL", "http://127.0.0.1:9/api")
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_import(module: str, repeats: int, home: str) -> dict:
+    """Median cold import time of a module, plus the modules it pulled in"""
+    runs = [
+        _run_snippet(IMPORT_SNIPPET.format(root=str(ROOT_DIR), module=module), home)
+        for _ in range(repeats)
+    ]
+    return {
+        "ms": statistics.median(run["ms"] for run in runs),
+        "modules": set(runs[0]["modules"])
+    }
+
+
+def measure_first_render(repeats: int, home: str) -> dict:
+    """Median time to run main.py once in Streamlit's headless AppTest"""
+    runs = [
+        _run_snippet(RENDER_SNIPPET.format(root=str(ROOT_DIR), script=str(ROOT_DIR / "main.py")), home)
+        for _ in range(repeats)
+    ]
+    return {
+        "ms": statistics.median(run["ms"] for run in runs),
+        "exceptions": runs[0]["exceptions"]
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the stored budget")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    repeats = budget.get("repeats", 5)
+    failures = []
+    measured = {"cold_import_ms": {}}
+
+    with tempfile.TemporaryDirectory() as home:
+        for module, limit in budget["cold_import_ms"].items():
+            try:
+                result = measure_import(module, repeats, home)
+            except RuntimeError as e:
+                failures.append(f"import {module}: {e}")
+                continue
+
+            measured["cold_import_ms"][module] = result["ms"]
+            status = "ok" if result["ms"] <= limit else "OVER"
+            print(f"import {module:<40} {result['ms']:8.1f} ms  (budget {limit} ms)  {status}")
+            if result["ms"] > limit:
+                failures.append(f"import {module}: {result['ms']:.1f} ms > {limit} ms")
+
+            leaked = result["modules"] & set(budget.get("forbidden_startup_modules", []))
+            if leaked:
+                failures.append(f"import {module} eagerly loads {', '.join(sorted(leaked))}")
+
+        try:
+            render = measure_first_render(repeats, home)
+        except (RuntimeError, ValueError) as e:
+            failures.append(f"first render: {e}")
+        else:
+            measured["first_render_ms"] = render["ms"]
+            limit = budget["first_render_ms"]
+            status = "ok" if render["ms"] <= limit else "OVER"
+            print(f"first render (main.py){'':<26} {render['ms']:8.1f} ms  (budget {limit} ms)  {status}")
+            if render["ms"] > limit:
+                failures.append(f"first render: {render['ms']:.1f} ms > {limit} ms")
+            for exception in render["exceptions"]:
+                failures.append(f"first render raised: {exception}")
+
+    if args.update:
+        for module, ms in measured["cold_import_ms"].items():
+            budget["cold_import_ms"][module] = round(ms * HEADROOM)
+        if "first_render_ms" in measured:
+            budget["first_render_ms"] = round(measured["first_render_ms"] * HEADROOM)
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget updated: {BUDGET_FILE}")
+        return 0
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\nStartup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
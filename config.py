@@ -4,10 +4,18 @@ Loads settings from server API and local cache
 """
 import os
 import json
-import httpx
+import random
+import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+# Revalidation outcomes
+SYNCED = "synced"            # 200 or 304: the snapshot is current
+REJECTED = "rejected"        # 4xx or a bad body: retrying won't help
+UNREACHABLE = "unreachable"  # transport error, 429 or 5xx: retry later
 
 class AppConfig:
     """Application configuration with server sync"""
@@ -16,42 +24,126 @@ class AppConfig:
     CACHE_DIR = Path.home() / ".aigem2" / "cache"
     CONFIG_CACHE_FILE = CACHE_DIR / "config.json"
     CACHE_VALIDITY_HOURS = 24
+    FETCH_TIMEOUT = 5.0
+    # Failed background revalidations retry with jittered exponential backoff
+    RETRY_BASE_SECONDS = 30.0
+    RETRY_MAX_SECONDS = 1800.0
+    ADMIN_MODE = os.getenv("AIGEM2_ADMIN") == "1"
+    PLUGIN_MEMORY_BUDGET_MB = int(os.getenv("AIGEM2_PLUGIN_MEMORY_MB", "256"))
+    PLUGIN_HOT_RELOAD = os.getenv("AIGEM2_PLUGIN_HOT_RELOAD") == "1"
+    TRACE_OVERLAY = os.getenv("AIGEM2_TRACE_OVERLAY") == "1"
     
     def __init__(self):
         self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        # Bumped whenever a new snapshot replaces _config
+        self.version = 0
         self._config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load config from cache or fetch from server"""
+        """Serve cached (or default) config now; revalidate stale data in the background"""
+        cache_data = self._read_cache()
         
-        # Try cache first
-        if self.CONFIG_CACHE_FILE.exists():
-            cache_data = json.loads(self.CONFIG_CACHE_FILE.read_text())
+        if cache_data:
             cache_time = datetime.fromisoformat(cache_data.get("cached_at", "2000-01-01"))
-            
-            if datetime.utcnow() - cache_time < timedelta(hours=self.CACHE_VALIDITY_HOURS):
-                return cache_data.get("config", self._default_config())
+            if datetime.utcnow() - cache_time >= timedelta(hours=self.CACHE_VALIDITY_HOURS):
+                self.revalidate_async()
+            return cache_data.get("config", self._default_config())
         
-        # Fetch from server
+        self.revalidate_async()
+        return self._default_config()
+    
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """Cached config file, or None if missing or unreadable"""
         try:
-            response = httpx.get(f"{self.API_BASE_URL}/config/pricing", timeout=5.0)
-            if response.status_code == 200:
-                config = response.json()
-                self._save_cache(config)
-                return config
-        except:
-            pass
+            return json.loads(self.CONFIG_CACHE_FILE.read_text())
+        except (OSError, ValueError):
+            return None
+    
+    def revalidate_async(self):
+        """Start a background conditional fetch (at most one at a time)"""
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._revalidate_until_answered, name="config-revalidate", daemon=True
+            )
+            self._refresh_thread.start()
+    
+    def _revalidate_until_answered(self):
+        """Background revalidation, retried with backoff while the server is unreachable"""
+        delay = self.RETRY_BASE_SECONDS
+        while self._revalidate() == UNREACHABLE:
+            time.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, self.RETRY_MAX_SECONDS)
+    
+    def _revalidate(self, conditional: bool = True) -> str:
+        """Fetch config from server; returns SYNCED, REJECTED or UNREACHABLE"""
+        cache_data = self._read_cache() or {}
         
-        # Fallback to default
-        return self._default_config()
+        headers = {}
+        if conditional and cache_data.get("config"):
+            if cache_data.get("etag"):
+                headers["If-None-Match"] = cache_data["etag"]
+            if cache_data.get("last_modified"):
+                headers["If-Modified-Since"] = cache_data["last_modified"]
+        
+        try:
+            from api_client import get_api_client
+            response = get_api_client().get(
+                f"{self.API_BASE_URL}/config/pricing",
+                headers=headers,
+                timeout=self.FETCH_TIMEOUT
+            )
+        except Exception as e:
+            print(f"Config sync failed: {e}")
+            return UNREACHABLE
+        
+        if response.status_code == 304:
+            # Unchanged: keep the snapshot, restart the validity window
+            self._save_cache(cache_data["config"], cache_data.get("etag"), cache_data.get("last_modified"))
+            return SYNCED
+        
+        if response.status_code != 200:
+            print(f"Config sync failed: HTTP {response.status_code}")
+            if response.status_code == 429 or response.status_code >= 500:
+                return UNREACHABLE
+            return REJECTED
+        
+        try:
+            config = response.json()
+        except ValueError as e:
+            print(f"Config sync returned invalid JSON: {e}")
+            return REJECTED
+        
+        self._save_cache(config, response.headers.get("etag"), response.headers.get("last-modified"))
+        
+        # Reference swap: readers see either the old or the new snapshot
+        with self._lock:
+            self._config = config
+            self.version += 1
+        return SYNCED
     
-    def _save_cache(self, config: Dict[str, Any]):
-        """Save config to local cache""" 
+    def _save_cache(self, config: Dict[str, Any], etag: Optional[str] = None,
+                    last_modified: Optional[str] = None):
+        """Save config to local cache (atomic replace)""" 
         cache_data = {
             "cached_at": datetime.utcnow().isoformat(),
+            "etag": etag,
+            "last_modified": last_modified,
             "config": config
         }
-        self.CONFIG_CACHE_FILE.write_text(json.dumps(cache_data, indent=2))
+        
+        fd, tmp_path = tempfile.mkstemp(dir=self.CACHE_DIR, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache_data, f, indent=2)
+            os.replace(tmp_path, self.CONFIG_CACHE_FILE)
+        except OSError as e:
+            print(f"Failed to write config cache: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
     
     def _default_config(self) -> Dict[str, Any]:
         """Default configuration (offline fallback)""" 
@@ -114,8 +206,6 @@ class AppConfig:
         """Get configuration for specific tier""" 
         return self._config.get("tiers", {}).get(tier, {})
     
-    def refresh(self):
-        """Force refresh config from server""" 
-        if self.CONFIG_CACHE_FILE.exists():
-            self.CONFIG_CACHE_FILE.unlink()
-        self._config = self._load_config()
\ No newline at end of file
+    def refresh(self) -> bool:
+        """Force refresh config from server; False keeps the cached snapshot""" 
+        return self._revalidate(conditional=False) == SYNCED
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+AIGEM2 Entitlements
+Tier features and limits compiled once per config version, plus a local usage ledger
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple
+
+from modules.registry import TIER_HIERARCHY
+
+# Metered usage -> monthly limit key in the tier config
+VIDEO_DOWNLOADS = "video_downloads"
+AI_TOKENS = "ai_tokens"
+MONTHLY_LIMITS = {
+    VIDEO_DOWNLOADS: "video_downloads_monthly",
+    AI_TOKENS: "ai_tokens_monthly",
+}
+STORAGE_LIMIT = "storage_limit_mb"
+
+# Before the ledger existed, the download quota was counted from the media catalog
+DOWNLOADS_DB = "~/.aigem2/video_downloader.db"
+
+
+class Entitlements:
+    """What one tier may do: a feature bitmask and a limits dict"""
+
+    def __init__(self, tier: str, mask: int, bits: Dict[str, int], limits: Dict[str, int]):
+        self.tier = tier
+        self.mask = mask
+        self._bits = bits
+        self.limits = limits
+
+    def has(self, feature: str) -> bool:
+        """Feature flag check (a dict lookup and a bit test)"""
+        bit = self._bits.get(feature)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+    def tier_at_least(self, required_tier: str) -> bool:
+        """Whether this tier includes everything required_tier has"""
+        return self.has(f"tier:{required_tier}")
+
+    def limit(self, name: str) -> Optional[int]:
+        """Configured limit, or None when unlimited"""
+        value = self.limits.get(name, -1)
+        return None if value == -1 else value
+
+    def remaining(self, metric: str, ledger: "UsageLedger" = None) -> Optional[int]:
+        """Units of a monthly metric left this month, or None when unlimited"""
+        limit = self.limit(MONTHLY_LIMITS[metric])
+        if limit is None:
+            return None
+        used = (ledger or get_usage_ledger()).month_total(metric)
+        return max(limit - used, 0)
+
+    def can_use(self, metric: str, amount: int = 1, ledger: "UsageLedger" = None) -> bool:
+        remaining = self.remaining(metric, ledger)
+        return remaining is None or remaining >= amount
+
+
+def compile_entitlements(config) -> Dict[str, Entitlements]:
+    """Turn the tier config into one Entitlements per tier
+
+    Tiers are cumulative along TIER_HIERARCHY; "all_<tier>" markers in the
+    config are implied by that and dropped.
+    """
+    tiers = {tier: config.get_tier_config(tier) for tier in TIER_HIERARCHY}
+
+    bits: Dict[str, int] = {}
+    for tier in TIER_HIERARCHY:
+        bits[f"tier:{tier}"] = len(bits)
+        for feature in tiers[tier].get("features", {}):
+            if not feature.startswith("all_") and feature not in bits:
+                bits[feature] = len(bits)
+
+    compiled = {}
+    mask = 0
+    for tier in TIER_HIERARCHY:
+        tier_config = tiers[tier]
+        mask |= 1 << bits[f"tier:{tier}"]
+        for feature, enabled in tier_config.get("features", {}).items():
+            if enabled and feature in bits:
+                mask |= 1 << bits[feature]
+
+        limits = {key: tier_config.get(key, -1) for key in (STORAGE_LIMIT, *MONTHLY_LIMITS.values())}
+        compiled[tier] = Entitlements(tier, mask, bits, limits)
+
+    return compiled
+
+
+_compiled: Dict[int, Tuple[int, Dict[str, Entitlements]]] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_entitlements(config, tier: str) -> Entitlements:
+    """Entitlements for a tier, recompiled only when the config version changes
+
+    Unknown tiers (e.g. NOT_ACTIVATED) are denied by default: no features,
+    not even FREE's, and zero quotas.
+    """
+    cached = _compiled.get(id(config))
+    if cached is None or cached[0] != config.version:
+        with _compiled_lock:
+            cached = _compiled.get(id(config))
+            if cached is None or cached[0] != config.version:
+                cached = (config.version, compile_entitlements(config))
+                _compiled[id(config)] = cached
+
+    entitlements = cached[1]
+    if tier not in entitlements:
+        bits = entitlements[TIER_HIERARCHY[0]]._bits
+        return Entitlements(tier, 0, bits, {key: 0 for key in (STORAGE_LIMIT, *MONTHLY_LIMITS.values())})
+    return entitlements[tier]
+
+
+class UsageLedger:
+    """Append-only usage events with monthly rollups maintained alongside"""
+
+    def __init__(self, db_path: str = "~/.aigem2/usage.db", downloads_db_path: str = DOWNLOADS_DB):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], int] = {}
+        self._signature = None
+        self._init_database()
+        self._backfill_downloads(Path(downloads_db_path).expanduser())
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS usage_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                metric TEXT NOT NULL,
+                amount INTEGER NOT NULL,
+                detail TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS usage_monthly (
+                month TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (month, metric)
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS usage_backfills (
+                metric TEXT PRIMARY KEY,
+                backfilled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def _backfill_downloads(self, downloads_db_path: Path):
+        """Carry this month's downloads over from the media catalog (once)
+
+        Without this, upgrading would reset everyone's monthly download quota.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("INSERT OR IGNORE INTO usage_backfills (metric) VALUES (?)", (VIDEO_DOWNLOADS,))
+        if cursor.rowcount == 0:
+            conn.close()
+            return
+
+        count = 0
+        if downloads_db_path.exists():
+            try:
+                source = sqlite3.connect(downloads_db_path)
+                count = source.execute("""
+                    SELECT COUNT(*) FROM media_files
+                    WHERE downloaded_at >= strftime('%Y-%m-01 00:00:00', 'now')
+                """).fetchone()[0]
+                source.close()
+            except sqlite3.Error as e:
+                print(f"Could not backfill download usage: {e}")
+
+        # Downloads the ledger already recorded are in the catalog too
+        month = self.current_month()
+        cursor.execute("SELECT total FROM usage_monthly WHERE month = ? AND metric = ?", (month, VIDEO_DOWNLOADS))
+        row = cursor.fetchone()
+        missing = count - (row[0] if row else 0)
+
+        if missing > 0:
+            cursor.execute("""
+                INSERT INTO usage_events (metric, amount, detail) VALUES (?, ?, ?)
+            """, (VIDEO_DOWNLOADS, missing, "backfill from media catalog"))
+            cursor.execute("""
+                INSERT INTO usage_monthly (month, metric, total) VALUES (?, ?, ?)
+                ON CONFLICT(month, metric) DO UPDATE SET total = total + excluded.total
+            """, (month, VIDEO_DOWNLOADS, missing))
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def current_month() -> str:
+        return datetime.utcnow().strftime("%Y-%m")
+
+    def record(self, metric: str, amount: int = 1, detail: Optional[str] = None):
+        """Append a usage event and bump its monthly rollup in one transaction"""
+        month = self.current_month()
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO usage_events (metric, amount, detail) VALUES (?, ?, ?)
+        """, (metric, amount, detail))
+        cursor.execute("""
+            INSERT INTO usage_monthly (month, metric, total) VALUES (?, ?, ?)
+            ON CONFLICT(month, metric) DO UPDATE SET total = total + excluded.total
+        """, (month, metric, amount))
+
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self._totals.clear()
+
+    def month_total(self, metric: str, month: Optional[str] = None) -> int:
+        """Usage of a metric in a month (current month by default)"""
+        month = month or self.current_month()
+        self._check_external_writes()
+
+        key = (month, metric)
+        with self._lock:
+            if key in self._totals:
+                return self._totals[key]
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT total FROM usage_monthly WHERE month = ? AND metric = ?", key)
+        row = cursor.fetchone()
+        conn.close()
+
+        total = row[0] if row else 0
+        with self._lock:
+            self._totals[key] = total
+        return total
+
+    def monthly_rollup(self, months: int = 12) -> List[Dict[str, Any]]:
+        """Per-month totals, newest first"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT * FROM usage_monthly
+            WHERE month IN (SELECT DISTINCT month FROM usage_monthly ORDER BY month DESC LIMIT ?)
+            ORDER BY month DESC, metric
+        """, (months,))
+
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        return rows
+
+    def _check_external_writes(self):
+        """Drop cached totals when another process changed the database"""
+        try:
+            stat = os.stat(self.db_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        with self._lock:
+            if signature != self._signature:
+                self._totals.clear()
+                self._signature = signature
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Process-wide usage ledger"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = UsageLedger()
+    return _ledger
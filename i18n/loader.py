@@ -1,4 +1,141 @@
-# multi-language loader implementation
+"""
+i18n Catalog
+Message catalogs compiled once per process, with precomputed fallbacks
+"""
+import json
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict
+
+I18N_DIR = Path(__file__).parent
+DEFAULT_LANGUAGE = "en"
+
+# Languages tried after the requested one (DEFAULT_LANGUAGE is always last)
+FALLBACKS: Dict[str, List[str]] = {"id": ["en"]}
+
+
+class Catalog:
+    """Lazily compiled {key: text} dicts per language"""
+
+    def __init__(self, directory: Path = I18N_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._compiled: Dict[str, Dict[str, str]] = {}
+        self._untranslated: Dict[str, List[str]] = {}
+        self._unknown: set = set()
+
+    def languages(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("*.json"))
+
+    def chain(self, language: str) -> List[str]:
+        """Resolution order for a language, e.g. id -> en"""
+        chain = [language, *FALLBACKS.get(language, [])]
+        if DEFAULT_LANGUAGE not in chain:
+            chain.append(DEFAULT_LANGUAGE)
+        return chain
+
+    def compiled(self, language: str) -> Dict[str, str]:
+        """Flat dict with the whole fallback chain already applied"""
+        catalog = self._compiled.get(language)
+        if catalog is not None:
+            return catalog
+
+        with self._lock:
+            if language not in self._compiled:
+                self._compiled[language] = self._compile(language)
+            return self._compiled[language]
+
+    def _compile(self, language: str) -> Dict[str, str]:
+        chain = self.chain(language)
+        own = self._read(language)
+
+        # Apply the chain from the last fallback up, so earlier languages win
+        merged: Dict[str, str] = {}
+        for lang in reversed(chain):
+            merged.update(own if lang == language else self._read(lang))
+
+        self._untranslated[language] = sorted(key for key in merged if key not in own)
+        return {sys.intern(key): sys.intern(text) for key, text in merged.items()}
+
+    def _read(self, language: str) -> Dict[str, str]:
+        path = self.directory / f"{language}.json"
+        try:
+            return {str(key): str(text) for key, text in json.loads(path.read_text(encoding="utf-8")).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Failed to load language file {path.name}: {e}")
+            return {}
+
+    def get(self, language: str, key: str) -> str:
+        """Text for key, or the key itself when no language in the chain has it"""
+        text = self.compiled(language).get(key)
+        if text is None:
+            self._unknown.add(key)
+            return key
+        return text
+
+    def missing_report(self) -> Dict[str, object]:
+        """Keys served from a fallback language, and keys missing everywhere"""
+        for language in self.languages():
+            self.compiled(language)
+        return {
+            "untranslated": {lang: list(keys) for lang, keys in self._untranslated.items() if keys},
+            "unknown": sorted(self._unknown)
+        }
+
+    def reload(self):
+        """Drop compiled catalogs (e.g. after editing the JSON files)"""
+        with self._lock:
+            self._compiled.clear()
+            self._untranslated.clear()
+        _format.cache_clear()
+
+
+catalog = Catalog()
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+
+def get_language() -> str:
+    """The current session's language (read on every call, so full reruns,
+    fragment reruns and callbacks all agree); default outside a script run"""
+    if get_script_run_ctx is None or get_script_run_ctx() is None:
+        return DEFAULT_LANGUAGE
+
+    import streamlit as st
+    return st.session_state.get("language", DEFAULT_LANGUAGE)
+
+
+def get_text(key: str, **kwargs) -> str:
+    """Translated text for key; keyword arguments fill {placeholders}"""
+    language = get_language()
+    if not kwargs:
+        return catalog.get(language, key)
+    try:
+        return _format(language, key, tuple(sorted(kwargs.items())))
+    except TypeError:
+        # Unhashable argument: format without the cache
+        return _safe_format(catalog.get(language, key), kwargs)
+
+
+@lru_cache(maxsize=1024)
+def _format(language: str, key: str, items: tuple) -> str:
+    return _safe_format(catalog.get(language, key), dict(items))
+
+
+def _safe_format(template: str, values: Dict[str, object]) -> str:
+    try:
+        return template.format(**values)
+    except (KeyError, IndexError, ValueError) as e:
+        print(f"Bad placeholders in '{template}': {e}")
+        return template
+
 
 class LanguageLoader:
     def __init__(self, language_files):
@@ -1,34 +1,179 @@
-import platform
+"""
+Hardware Fingerprint
+Stable machine identifier, read from /sys and /proc on Linux and cached on disk
+"""
 import hashlib
+import hmac
+import json
+import os
+import platform
 import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..crypto.obfuscation import machine_key
+
+CACHE_FILE = Path.home() / ".aigem2" / "cache" / "hwid.json"
+
+DMI_DIR = Path("/sys/class/dmi/id")
+NET_DIR = Path("/sys/class/net")
+CPUINFO = Path("/proc/cpuinfo")
+CPU_FIELDS = ("vendor_id", "cpu family", "model", "model name", "stepping", "Hardware", "Serial")
+# Cheap single-file reads re-checked on every cache load; product_uuid is
+# root-only on most distros and simply reads as None otherwise
+ANCHOR_FILES = (Path("/etc/machine-id"), DMI_DIR / "product_uuid",
+                DMI_DIR / "board_vendor", DMI_DIR / "board_name")
+
+
+def _read(path: Path) -> Optional[str]:
+    """Stripped file contents, or None if missing/unreadable (many DMI fields are root-only)"""
+    try:
+        value = path.read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    return value or None
+
 
 class HardwareFingerprint:
-    def __init__(self):
-        self.cpu_id = self.get_cpu_id()
-        self.motherboard_serial = self.get_motherboard_serial()
-        self.mac_address = self.get_mac_address()
-
-    def get_cpu_id(self):
-        # Platform-specific implementation to get CPU ID
-        pass
-
-    def get_motherboard_serial(self):
-        # Platform-specific implementation to get motherboard serial
-        pass
-
-    def get_mac_address(self):
-        if platform.system() == 'Windows':
-            # Get MAC address for Windows
-            pass
-        elif platform.system() == 'Darwin':
-            # Get MAC address for macOS
-            pass
-        else:
-            # Get MAC address for Linux
-            pass
+    """Collect hardware identifiers without spawning subprocesses"""
+
+    def __init__(self, cache_file: Path = CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self._components: Optional[Dict[str, Optional[str]]] = None
+
+    @property
+    def cpu_id(self) -> Optional[str]:
+        return self.components()["cpu"]
+
+    @property
+    def motherboard_serial(self) -> Optional[str]:
+        return self.components()["board"]
+
+    @property
+    def mac_address(self) -> Optional[str]:
+        return self.components()["mac"]
+
+    def components(self) -> Dict[str, Optional[str]]:
+        """Raw identifiers (collected once per instance)"""
+        if self._components is None:
+            self._components = {
+                "cpu": self.get_cpu_id(),
+                "board": self.get_motherboard_serial(),
+                "mac": self.get_mac_address(),
+                "machine_id": _read(Path("/etc/machine-id"))
+            }
+        return self._components
+
+    def get_cpu_id(self) -> Optional[str]:
+        """CPU identity from /proc/cpuinfo (first processor block)"""
+        if platform.system() != 'Linux':
+            return platform.processor() or None
+
+        cpuinfo = _read(CPUINFO)
+        if not cpuinfo:
+            return None
+
+        # x86 repeats every field per core and ARM adds Hardware/Serial at
+        # the end; the first occurrence of each field is enough
+        fields = {}
+        for line in cpuinfo.splitlines():
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if key in CPU_FIELDS:
+                fields.setdefault(key, value.strip())
+
+        return "|".join(f"{key}={fields[key]}" for key in CPU_FIELDS if key in fields) or None
+
+    def get_motherboard_serial(self) -> Optional[str]:
+        """Board serial / product UUID from DMI, falling back to readable vendor fields"""
+        if platform.system() != 'Linux':
+            return None
+
+        for name in ("board_serial", "product_uuid", "product_serial"):
+            value = _read(DMI_DIR / name)
+            if value and value.lower() not in ("none", "to be filled by o.e.m.", "default string"):
+                return value
+
+        # Unprivileged users can usually read these
+        parts = [_read(DMI_DIR / name) for name in ("board_vendor", "board_name", "product_name")]
+        return "|".join(part for part in parts if part) or None
+
+    def get_mac_address(self) -> Optional[str]:
+        """MAC of the first physical network interface"""
+        if platform.system() == 'Linux' and NET_DIR.is_dir():
+            macs = []
+            for interface in sorted(os.listdir(NET_DIR)):
+                # Physical NICs have a backing device; lo, bridges, veth and tun don't
+                if not (NET_DIR / interface / "device").exists():
+                    continue
+                mac = _read(NET_DIR / interface / "address")
+                if mac and mac != "00:00:00:00:00:00":
+                    macs.append(mac)
+            if macs:
+                return macs[0]
+
+        node = uuid.getnode()
+        # Bit 40 set means getnode() made up a random address
+        if node >> 40 & 1:
+            return None
+        return ":".join(f"{node >> shift & 0xff:02x}" for shift in range(40, -1, -8))
+
+    def get_os_info(self) -> str:
+        """OS name, release and architecture"""
+        return f"{platform.system()} {platform.release()} ({platform.machine()})"
+
+    def generate(self) -> str:
+        """Fingerprint for this machine (cached on disk after the first run)"""
+        cached = self._load_cache()
+        if cached:
+            return cached
+
+        data = json.dumps(self.components(), sort_keys=True)
+        fingerprint = hashlib.sha256(data.encode()).hexdigest()
+        self._save_cache(fingerprint)
+        return fingerprint
+
+    def _load_cache(self) -> Optional[str]:
+        """Cached fingerprint if its HMAC checks out for this machine and hardware"""
+        try:
+            cache = json.loads(self.cache_file.read_text())
+            fingerprint = cache["fingerprint"]
+            signature = cache["signature"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if not isinstance(fingerprint, str) or not isinstance(signature, str):
+            return None
+
+        # Rejects edited files, caches copied from another machine/user and
+        # caches whose anchor identifiers changed (cloned disk, swapped board)
+        if not hmac.compare_digest(signature, self._sign(fingerprint)):
+            return None
+        return fingerprint
+
+    def _save_cache(self, fingerprint: str):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({
+                "fingerprint": fingerprint,
+                "signature": self._sign(fingerprint)
+            }))
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"Failed to cache hardware fingerprint: {e}")
+
+    @staticmethod
+    def _anchor() -> str:
+        """Stable identifiers mixed into the cache signature"""
+        return "|".join(_read(path) or "" for path in ANCHOR_FILES)
+
+    def _sign(self, fingerprint: str) -> str:
+        message = f"{fingerprint}\n{self._anchor()}"
+        return hmac.new(machine_key(), message.encode(), hashlib.sha256).hexdigest()
 
     def generate_license_key(self):
         data = f'{self.cpu_id}-{self.motherboard_serial}-{self.mac_address}'
         hash_object = hashlib.sha256(data.encode())
         license_key = hash_object.hexdigest()
-        return f'{license_key[:4]}-{license_key[4:8]}-{license_key[8:12]}-{license_key[12:16]}-{license_key[16:20]}'
\ No newline at end of file
+        return f'{license_key[:4]}-{license_key[4:8]}-{license_key[8:12]}-{license_key[12:16]}-{license_key[16:20]}'
@@ -0,0 +1,162 @@
+"""
+Heartbeat Scheduler
+One background thread per process that keeps the activation key fresh
+"""
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+HEARTBEAT_INTERVAL = 7 * 24 * 3600
+JITTER = 12 * 3600
+MIN_RETRY_GAP = 60
+LOCK_TTL = 120
+POLL_INTERVAL = 3600
+
+STATE_DIR = Path.home() / ".aigem2"
+STATE_FILE = STATE_DIR / "heartbeat.json"
+LOCK_FILE = STATE_DIR / "heartbeat.lock"
+
+
+class HeartbeatScheduler:
+    """Schedule heartbeats with jitter, deduplicated across processes by a lock file"""
+
+    def __init__(self, state_file: Path = STATE_FILE, lock_file: Path = LOCK_FILE):
+        self.state_file = Path(state_file)
+        self.lock_file = Path(lock_file)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._force = False
+        self._last_request: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_started(self):
+        """Start the scheduler thread (cheap to call on every rerun)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="license-heartbeat", daemon=True)
+            self._thread.start()
+
+    def request_now(self):
+        """Send a heartbeat as soon as possible (e.g. the grace window ran out)
+
+        Called on every rerun while offline, so repeats within MIN_RETRY_GAP
+        are dropped here instead of waking the thread to read the state file.
+        """
+        now = time.monotonic()
+        if self._last_request is None or now - self._last_request >= MIN_RETRY_GAP:
+            self._last_request = now
+            self._force = True
+            self._wake.set()
+        self.ensure_started()
+
+    def _run(self):
+        while True:
+            force, self._force = self._force, False
+            try:
+                self._maybe_send(force)
+            except Exception as e:
+                print(f"Heartbeat scheduling failed: {e}")
+
+            self._wake.wait(self._seconds_until_due())
+            self._wake.clear()
+
+    def _maybe_send(self, force: bool = False):
+        """Send if due; the lock file keeps other processes from sending too"""
+        with self._exclusive() as acquired:
+            if not acquired:
+                return
+
+            # Re-read under the lock: another process may have just sent one
+            state = self._read_state()
+            now = time.time()
+            if now - state.get("last_sent", 0) < MIN_RETRY_GAP:
+                return
+            if not force and now < state.get("next_due", 0):
+                return
+
+            from .license_validator import LicenseValidator
+            from outbox import get_outbox
+
+            # Queued, not sent inline: the outbox handles offline and backoff
+            LicenseValidator().heartbeat()
+            get_outbox().wake()
+
+            self._write_state({
+                "last_sent": now,
+                "next_due": now + HEARTBEAT_INTERVAL + random.uniform(-JITTER, JITTER)
+            })
+
+    def _seconds_until_due(self) -> float:
+        next_due = self._read_state().get("next_due", 0)
+        return min(max(next_due - time.time(), MIN_RETRY_GAP), POLL_INTERVAL)
+
+    @contextmanager
+    def _exclusive(self):
+        """Yield True while holding the cross-process lock file, False if someone else has it"""
+        fd = None
+        try:
+            fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # A holder that crashed leaves the file behind
+            try:
+                if time.time() - self.lock_file.stat().st_mtime > LOCK_TTL:
+                    self.lock_file.unlink()
+                    fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except OSError:
+                fd = None
+
+        if fd is None:
+            yield False
+            return
+
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            yield True
+        finally:
+            os.close(fd)
+            try:
+                self.lock_file.unlink()
+            except OSError:
+                pass
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: Dict[str, Any]):
+        """Atomic replace so other processes never read a partial file"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_file.parent, prefix=".heartbeat-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            print(f"Failed to write heartbeat state: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+_scheduler: Optional[HeartbeatScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_heartbeat_scheduler() -> HeartbeatScheduler:
+    """Process-wide heartbeat scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = HeartbeatScheduler()
+    return _scheduler
@@ -0,0 +1,80 @@
+"""
+License State
+Process-wide memo of the offline license check, keyed on the key file
+"""
+import os
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
+
+from .license_validator import LicenseValidator
+from ..crypto.obfuscation import ObfuscatedStorage
+
+_UNSET = object()
+
+
+class LicenseState:
+    """Re-derive the offline tier only when it can have changed
+
+    The cached answer is reused until the key file's (mtime, inode, size)
+    changes or the offline grace window runs out, so a check is one stat().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._storage: Optional[ObfuscatedStorage] = None
+        self._signature = _UNSET
+        self._tier: Optional[str] = None
+        self._expires_at: Optional[datetime] = None
+
+    def offline_tier(self) -> Optional[str]:
+        """Tier, "REQUIRE_ONLINE", or None when not activated"""
+        storage = self._get_storage()
+        signature = self._file_signature(storage)
+
+        with self._lock:
+            if signature == self._signature and not self._expired():
+                return self._tier
+
+        tier, expires_at = LicenseValidator.evaluate_activation_key(storage.load_activation_key())
+
+        with self._lock:
+            self._signature = signature
+            self._tier = tier
+            self._expires_at = expires_at
+        return tier
+
+    def invalidate(self):
+        """Force the next check to re-read the key file"""
+        with self._lock:
+            self._signature = _UNSET
+
+    def _expired(self) -> bool:
+        return self._expires_at is not None and datetime.utcnow() >= self._expires_at
+
+    def _get_storage(self) -> ObfuscatedStorage:
+        if self._storage is None:
+            self._storage = ObfuscatedStorage()
+        return self._storage
+
+    @staticmethod
+    def _file_signature(storage: ObfuscatedStorage) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(storage.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+_state: Optional[LicenseState] = None
+_state_lock = threading.Lock()
+
+
+def get_license_state() -> LicenseState:
+    """Process-wide license state"""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = LicenseState()
+    return _state
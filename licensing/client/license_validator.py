@@ -2,14 +2,20 @@
 License Validator
 Validates license offline and online
 """
-import jwt
-import httpx
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
+from api_client import get_api_client, ApiUnavailableError
+import outbox
 from .hardware_fingerprint import HardwareFingerprint
 from ..crypto.obfuscation import ObfuscatedStorage
 
+# Outbox kinds
+ACTIVATE = "license.activate"
+HEARTBEAT = "license.heartbeat"
+
+GRACE_PERIOD_DAYS = 30
+
 class LicenseValidator:
     """Validate license keys and activation"""
     
@@ -22,20 +28,18 @@ class LicenseValidator:
     def activate_license(self, license_key: str) -> Dict[str, Any]:
         """Activate license with server"""
         hwid = self.hw_fingerprint.generate()
+        url = f"{self.API_BASE_URL}/license/activate"
+        payload = {
+            "license_key": license_key,
+            "hardware_fingerprint": hwid,
+            "device_info": {
+                "os": self.hw_fingerprint.get_os_info(),
+                "cpu": self.hw_fingerprint.get_cpu_id()
+            }
+        }
         
         try:
-            response = httpx.post(
-                f"{self.API_BASE_URL}/license/activate",
-                json={
-                    "license_key": license_key,
-                    "hardware_fingerprint": hwid,
-                    "device_info": {
-                        "os": self.hw_fingerprint.get_os_info(),
-                        "cpu": self.hw_fingerprint.get_cpu_id()
-                    }
-                },
-                timeout=10.0
-            )
+            response = get_api_client().post(url, json=payload, timeout=10.0)
             
             if response.status_code == 200:
                 data = response.json()
@@ -56,74 +60,114 @@ class LicenseValidator:
                 }
         
         except Exception as e:
+            if not self._is_network_error(e):
+                return {
+                    "success": False,
+                    "message": f"Activation error: {str(e)}"
+                }
+            
+            # Offline: the outbox retries in the background (latest key wins)
+            outbox.get_outbox().enqueue(ACTIVATE, "POST", url, payload, coalesce_key=ACTIVATE)
             return {
                 "success": False,
-                "message": f"Network error: {str(e)}"
+                "queued": True,
+                "message": "You're offline. Activation will complete automatically once you're back online."
             }
     
+    @staticmethod
+    def _is_network_error(error: Exception) -> bool:
+        if isinstance(error, ApiUnavailableError):
+            return True
+        try:
+            import httpx
+        except ImportError:
+            return False
+        return isinstance(error, httpx.TransportError)
+    
     def validate_offline(self) -> Optional[str]:
         """Validate license offline (from local storage)"""
-        activation_key = self.storage.load_activation_key()
-        
+        tier, _ = self.evaluate_activation_key(self.storage.load_activation_key())
+        return tier
+    
+    @staticmethod
+    def evaluate_activation_key(activation_key: Optional[str]) -> Tuple[Optional[str], Optional[datetime]]:
+        """Offline tier for a key, and when that answer stops being valid (None = never)"""
         if not activation_key:
-            return None
+            return None, None
         
         try:
+            import jwt
+            
             # Decode JWT (no signature verification for offline)
             payload = jwt.decode(activation_key, options={"verify_signature": False})
             
             tier = payload.get("tier", "FREE")
-            issued = datetime.fromisoformat(payload["issued"])
             last_heartbeat = datetime.fromisoformat(payload.get("last_heartbeat", payload["issued"]))
             
             # Check offline grace period (30 days)
             days_since_heartbeat = (datetime.utcnow() - last_heartbeat).days
             
-            if days_since_heartbeat > 30:
-                return "REQUIRE_ONLINE"
+            if days_since_heartbeat > GRACE_PERIOD_DAYS:
+                return "REQUIRE_ONLINE", None
             
-            return tier
+            # First moment the day count above exceeds the grace period
+            return tier, last_heartbeat + timedelta(days=GRACE_PERIOD_DAYS + 1)
         
         except Exception as e:
-            return None
+            return None, None
     
     def heartbeat(self):
-        """Send heartbeat to server (background task)"""
+        """Queue a heartbeat; the outbox delivers it now or once back online"""
         activation_key = self.storage.load_activation_key()
         
         if not activation_key:
             return
         
-        try:
-            response = httpx.post(
-                f"{self.API_BASE_URL}/license/heartbeat",
-                json={"activation_key": activation_key},
-                timeout=5.0
-            )
-            
-            if response.status_code == 200:
-                # Update local activation key with new heartbeat timestamp
-                new_key = response.json()["activation_key"]
-                self.storage.save_activation_key(new_key)
-        
-        except:
-            # Silently fail (offline is OK)
-            pass
+        # Only the latest heartbeat matters, so pending ones are replaced
+        outbox.get_outbox().enqueue(
+            HEARTBEAT,
+            "POST",
+            f"{self.API_BASE_URL}/license/heartbeat",
+            {"activation_key": activation_key},
+            coalesce_key=HEARTBEAT
+        )
+
+
+def _save_returned_activation_key(payload: Dict[str, Any], response):
+    """Outbox callback: store the refreshed activation key from the server"""
+    if response.status_code == 200:
+        ObfuscatedStorage().save_activation_key(response.json()["activation_key"])
+    else:
+        print(f"License request rejected: HTTP {response.status_code}")
+
+
+# Activation uses up a device slot; only heartbeats are safe to resend blindly.
+# Both carry license secrets, so rejected items are deleted, not kept
+outbox.configure(ACTIVATE, idempotent=False, keep_failed=False)
+outbox.configure(HEARTBEAT, idempotent=True, keep_failed=False)
+outbox.subscribe(ACTIVATE, _save_returned_activation_key)
+outbox.subscribe(HEARTBEAT, _save_returned_activation_key)
 
 def check_license_validity() -> str:
     """Main function to check license status"""
-    validator = LicenseValidator()
+    from .license_state import get_license_state
+    from .heartbeat import get_heartbeat_scheduler
     
-    tier = validator.validate_offline()
+    # Memoized until the key file changes or the grace window ends
+    tier = get_license_state().offline_tier()
     
     if tier is None:
         return "NOT_ACTIVATED"
     
+    # Heartbeats run on a background thread (every ~7 days, jittered)
+    scheduler = get_heartbeat_scheduler()
+    
     if tier == "REQUIRE_ONLINE":
+        # Retry right away in the background; the refreshed key re-derives the tier
+        scheduler.request_now()
         # TODO: Show modal to user asking to go online
         return "FREE"  # Fallback to FREE temporarily
     
-    # Schedule heartbeat if needed (every 7 days)
-    # TODO: Implement background task
+    scheduler.ensure_started()
     
     return tier
@@ -7,9 +7,72 @@ import base64
 import hmac
 import hashlib
 import ctypes
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+
+def _xor(data: bytes, key: bytes) -> bytes:
+    """XOR data with a repeating key as one big-integer operation"""
+    if not data:
+        return b""
+    stream = (key * (len(data) // len(key) + 1))[:len(data)]
+    value = int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")
+    return value.to_bytes(len(data), "big")
+
+
+@lru_cache(maxsize=1)
+def machine_key() -> bytes:
+    """Machine-specific key (derived once per process)"""
+    if os.name == 'nt':  # Windows
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography")
+        guid, _ = winreg.QueryValueEx(key, "MachineGuid")
+        return hashlib.sha256(guid.encode()).digest()
+    else:
+        # Use hostname + username as fallback
+        import socket
+        import getpass
+        identifier = f"{socket.gethostname()}-{getpass.getuser()}"
+        return hashlib.sha256(identifier.encode()).digest()
+
+
+def seal(text: str) -> str:
+    """Obfuscate text with the machine key: XOR, Base64, then an HMAC signature"""
+    system_key = machine_key()
+    
+    # Layer 1: XOR encryption
+    xor_data = _xor(text.encode(), system_key)
+    
+    # Layer 2: Base64 encoding
+    b64_data = base64.b64encode(xor_data)
+    
+    # Layer 3: HMAC signature
+    signature = hmac.new(system_key, b64_data, hashlib.sha256).hexdigest()
+    return (b64_data + b'::' + signature.encode()).decode()
+
+
+def unseal(data: str) -> Optional[str]:
+    """Reverse seal(); None if the data was tampered with or sealed on another machine"""
+    try:
+        # Split data and signature
+        b64_data, signature = data.encode().rsplit(b'::', 1)
+        
+        # Verify signature
+        system_key = machine_key()
+        expected_sig = hmac.new(system_key, b64_data, hashlib.sha256).hexdigest().encode()
+        
+        if not hmac.compare_digest(signature, expected_sig):
+            # Tampered data!
+            return None
+        
+        # Decode Base64, then XOR decrypt
+        return _xor(base64.b64decode(b64_data), system_key).decode()
+    
+    except Exception as e:
+        return None
+
+
 class ObfuscatedStorage:
     """Store activation keys with maximum security"""
     
@@ -72,36 +135,12 @@ class ObfuscatedStorage:
     
     def _get_machine_key(self) -> bytes:
         """Get machine-specific key for obfuscation"""
-        if os.name == 'nt':  # Windows
-            import winreg
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography")
-            guid, _ = winreg.QueryValueEx(key, "MachineGuid")
-            return hashlib.sha256(guid.encode()).digest()
-        else:
-            # Use hostname + username as fallback
-            import socket
-            import getpass
-            identifier = f"{socket.gethostname()}-{getpass.getuser()}"
-            return hashlib.sha256(identifier.encode()).digest()
+        return machine_key()
     
     def save_activation_key(self, activation_key: str):
         """Save activation key with triple-layer obfuscation"""
-        system_key = self._get_machine_key()
-        
-        # Layer 1: XOR encryption
-        key_bytes = activation_key.encode()
-        xor_data = bytes([key_bytes[i] ^ system_key[i % len(system_key)] 
-                          for i in range(len(key_bytes))])
-        
-        # Layer 2: Base64 encoding
-        b64_data = base64.b64encode(xor_data)
-        
-        # Layer 3: HMAC signature
-        signature = hmac.new(system_key, b64_data, hashlib.sha256).hexdigest()
-        final_data = b64_data + b'::' + signature.encode()
-        
         # Write as binary
-        self.path.write_bytes(final_data)
+        self.path.write_bytes(seal(activation_key).encode())
         
         # Set hidden attribute on Windows
         if os.name == 'nt':
@@ -115,27 +154,6 @@ class ObfuscatedStorage:
             return None
         
         try:
-            data = self.path.read_bytes()
-            
-            # Split data and signature
-            b64_data, signature = data.rsplit(b'::', 1)
-            
-            # Verify signature
-            system_key = self._get_machine_key()
-            expected_sig = hmac.new(system_key, b64_data, hashlib.sha256).hexdigest().encode()
-            
-            if signature != expected_sig:
-                # Tampered file!
-                return None
-            
-            # Decode Base64
-            xor_data = base64.b64decode(b64_data)
-            
-            # XOR decrypt
-            key_bytes = bytes([xor_data[i] ^ system_key[i % len(system_key)] 
-                              for i in range(len(xor_data))])
-            
-            return key_bytes.decode()
-        
-        except Exception as e:
+            return unseal(self.path.read_bytes().decode())
+        except (OSError, UnicodeDecodeError):
             return None
@@ -20,21 +20,13 @@ st.set_page_config(
 )
 
 # Import core modules
-from config import AppConfig
-from ui.app import MainApp
-from licensing.client.license_validator import check_license_validity
+from services import get_session_app
 
 def main():
     """Main entry point - lightweight and fast"""
     
-    # Initialize config
-    config = AppConfig()
-    
-    # Check license status
-    license_status = check_license_validity()
-    
-    # Initialize main app
-    app = MainApp(config, license_status)
+    # Config, license status and the app are built once and reused across reruns
+    app = get_session_app()
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""
+Plugin Hot Reload
+Development-mode watcher that reloads a single plugin when its files change
+"""
+import importlib
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+POLL_INTERVAL = 1.0
+WATCHED_SUFFIXES = (".py", ".json")
+
+
+class PluginReloader:
+    """Poll plugin directories and swap in changed plugins"""
+
+    def __init__(self, modules_dir: Path, registry, runtime, poll_interval: float = POLL_INTERVAL):
+        self.modules_dir = Path(modules_dir)
+        self.registry = registry
+        self.runtime = runtime
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._signatures: Dict[str, Tuple] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the watcher thread (idempotent)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._signatures = self._scan()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="plugin-hot-reload", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def generation(self, plugin_id: str) -> int:
+        """Incremented every time a plugin is reloaded"""
+        return self._generations.get(plugin_id, 0)
+
+    def reload_plugin(self, plugin_id: str):
+        """Drop one plugin's module graph and service, then re-import it"""
+        print(f"Reloading plugin {plugin_id}")
+
+        # Old service gets its cleanup() call; other plugins' services are untouched
+        self.runtime.unload(plugin_id)
+
+        prefix = f"modules.{plugin_id}"
+        for module_name in [m for m in sys.modules if m == prefix or m.startswith(prefix + ".")]:
+            del sys.modules[module_name]
+        importlib.invalidate_caches()
+
+        self.registry.invalidate()
+        with self._lock:
+            self._generations[plugin_id] = self.generation(plugin_id) + 1
+
+        # Import now so syntax errors show up in the log right away
+        metadata = self.registry.get_metadata(plugin_id)
+        if metadata:
+            module_name = metadata["entry_point"].split(":")[0].replace(".py", "")
+            try:
+                importlib.import_module(f"{prefix}.{module_name}")
+            except Exception as e:
+                print(f"Reloaded plugin {plugin_id} failed to import: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                signatures = self._scan()
+            except OSError as e:
+                print(f"Plugin watcher scan failed: {e}")
+                continue
+
+            changed = [
+                plugin_id for plugin_id in set(signatures) | set(self._signatures)
+                if signatures.get(plugin_id) != self._signatures.get(plugin_id)
+            ]
+            self._signatures = signatures
+
+            for plugin_id in changed:
+                try:
+                    self.reload_plugin(plugin_id)
+                except Exception as e:
+                    print(f"Failed to reload plugin {plugin_id}: {e}")
+
+    def _scan(self) -> Dict[str, Tuple]:
+        """(path, mtime, size) of every watched file, per plugin"""
+        signatures = {}
+        for entry in os.scandir(self.modules_dir):
+            if not entry.is_dir() or entry.name.startswith(('_', '.')):
+                continue
+
+            files = []
+            for root, dirs, names in os.walk(entry.path):
+                dirs[:] = [d for d in dirs if d != "__pycache__"]
+                for name in names:
+                    if name.endswith(WATCHED_SUFFIXES):
+                        stat = os.stat(os.path.join(root, name))
+                        files.append((os.path.join(root, name), stat.st_mtime_ns, stat.st_size))
+            signatures[entry.name] = tuple(sorted(files))
+        return signatures
+
+
+_reloader: Optional[PluginReloader] = None
+_reloader_lock = threading.Lock()
+
+
+def get_plugin_reloader(registry, runtime) -> PluginReloader:
+    """Process-wide reloader, started on first use"""
+    global _reloader
+    if _reloader is None:
+        with _reloader_lock:
+            if _reloader is None:
+                _reloader = PluginReloader(Path(__file__).parent, registry, runtime)
+                _reloader.start()
+    return _reloader
@@ -0,0 +1,277 @@
+"""
+Plugin Process Isolation
+Run a plugin's service half in worker processes behind a small pipe-based RPC
+"""
+import importlib
+import inspect
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_WORKERS = 1
+CHECKOUT_TIMEOUT = 30.0
+
+# Message tags (worker -> client)
+RESULT = "result"
+CHUNK = "chunk"
+END = "end"
+ERROR = "error"
+
+
+class PluginWorkerError(RuntimeError):
+    """Raised in the UI process when a call fails inside a plugin worker"""
+
+
+def _worker_main(conn, module_path: str, class_name: str, root_dir: str):
+    """Worker process loop: build the service, then serve calls until told to stop"""
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+
+    try:
+        service = getattr(importlib.import_module(module_path), class_name)()
+        conn.send((RESULT, None, "ready"))
+    except Exception:
+        conn.send((ERROR, None, traceback.format_exc()))
+        return
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+
+        if message is None:
+            break
+
+        call_id, method, args, kwargs = message
+        try:
+            result = getattr(service, method)(*args, **kwargs)
+
+            # Generators are streamed item by item instead of materialized
+            if inspect.isgenerator(result):
+                for item in result:
+                    conn.send((CHUNK, call_id, item))
+                conn.send((END, call_id, None))
+            else:
+                conn.send((RESULT, call_id, result))
+        except Exception:
+            conn.send((ERROR, call_id, traceback.format_exc()))
+
+    if hasattr(service, "cleanup"):
+        service.cleanup()
+
+
+class _Worker:
+    """One worker process and the client end of its pipe"""
+
+    def __init__(self, context, module_path: str, class_name: str):
+        # Set when the pipe may hold unread messages; replaced on next checkout
+        self.dirty = False
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, module_path, class_name, str(ROOT_DIR)),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            tag, _, payload = self.conn.recv()
+        except EOFError:
+            tag, payload = ERROR, f"worker exited with code {self.process.exitcode}"
+        if tag == ERROR:
+            self.process.join(timeout=1)
+            raise PluginWorkerError(f"Plugin service failed to start:\n{payload}")
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class _RemoteStream:
+    """Iterator over chunks streamed from a worker"""
+
+    def __init__(self, proxy: "ProcessServiceProxy", worker: _Worker, first: Any):
+        self._proxy = proxy
+        self._worker = worker
+        self._pending = [first]
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._pending:
+            return self._pending.pop()
+        if self._done:
+            raise StopIteration
+
+        try:
+            tag, _, payload = self._worker.conn.recv()
+        except (OSError, EOFError) as e:
+            self._done = True
+            self._proxy._discard(self._worker)
+            raise PluginWorkerError(f"Plugin {self._proxy.plugin_id} worker died: {e}")
+
+        if tag == CHUNK:
+            return payload
+
+        self._done = True
+        self._proxy._idle.put(self._worker)
+        if tag == END:
+            raise StopIteration
+        raise PluginWorkerError(payload)
+
+    def close(self):
+        """Abandon the stream; the pipe still holds unread chunks, so the worker gets recycled
+
+        Also runs from __del__ (any thread, even at shutdown), so it only
+        marks the worker; the next call() replaces it.
+        """
+        if not self._done:
+            self._done = True
+            self._proxy._discard(self._worker)
+
+    def __del__(self):
+        self.close()
+
+
+class ProcessServiceProxy:
+    """Call a plugin service's methods in a pool of worker processes
+
+    Only method calls are forwarded; arguments and results must be picklable.
+    Methods that return generators are streamed back chunk by chunk.
+    """
+
+    def __init__(self, plugin_id: str, module_path: str, class_name: str,
+                 workers: int = DEFAULT_WORKERS):
+        self.plugin_id = plugin_id
+        self.module_path = module_path
+        self.class_name = class_name
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._call_id = 0
+        self._closed = False
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        # Dirty workers handed back without taking any lock (safe from finalizers)
+        self._discarded: deque = deque()
+
+        for _ in range(max(workers, 1)):
+            worker = _Worker(self._context, module_path, class_name)
+            self._workers.append(worker)
+            self._idle.put(worker)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def remote_method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        remote_method.__name__ = name
+        return remote_method
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Call a service method in the next idle worker"""
+        if self._closed:
+            raise PluginWorkerError(f"Plugin {self.plugin_id} workers are shut down")
+
+        worker = self._checkout()
+        with self._lock:
+            self._call_id += 1
+            call_id = self._call_id
+
+        try:
+            worker.conn.send((call_id, method, args, kwargs))
+            tag, _, payload = worker.conn.recv()
+        except (OSError, EOFError) as e:
+            self._discard(worker)
+            raise PluginWorkerError(f"Plugin {self.plugin_id} worker died: {e}")
+
+        if tag == CHUNK:
+            # Worker stays checked out until the stream is consumed
+            return _RemoteStream(self, worker, payload)
+
+        self._idle.put(worker)
+
+        if tag == ERROR:
+            raise PluginWorkerError(payload)
+        if tag == END:
+            return iter(())
+        return payload
+
+    def _checkout(self) -> _Worker:
+        """Next idle worker (fresh if it was dirty); PluginWorkerError after CHECKOUT_TIMEOUT"""
+        deadline = time.monotonic() + CHECKOUT_TIMEOUT
+        while True:
+            while self._discarded:
+                self._idle.put(self._discarded.popleft())
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PluginWorkerError(
+                    f"No idle worker for plugin {self.plugin_id} after {CHECKOUT_TIMEOUT:.0f}s "
+                    "(unconsumed streams keep workers checked out)"
+                )
+            try:
+                # Short waits so workers discarded meanwhile are picked up
+                worker = self._idle.get(timeout=min(remaining, 0.1))
+                break
+            except queue.Empty:
+                continue
+
+        if worker.dirty:
+            worker = self._replace(worker)
+        return worker
+
+    def _discard(self, worker: _Worker):
+        """Hand back a broken or dirty worker; replaced lazily on checkout"""
+        worker.dirty = True
+        self._discarded.append(worker)
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        """Swap a broken or dirty worker for a fresh one"""
+        worker.stop()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if self._closed:
+                raise PluginWorkerError(f"Plugin {self.plugin_id} workers are shut down")
+            replacement = _Worker(self._context, self.module_path, self.class_name)
+            self._workers.append(replacement)
+        return replacement
+
+    def memory_usage(self) -> int:
+        """Service memory lives in the workers; only the pipes count against the UI budget"""
+        return len(self._workers) * 1024 * 1024
+
+    def cleanup(self):
+        """Stop all worker processes"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+
+        for worker in workers:
+            worker.stop()
+
+
+def create_process_service(plugin_id: str, module_path: str, class_name: str,
+                           workers: Optional[int] = None) -> ProcessServiceProxy:
+    """Factory used by PluginManager for manifests with "isolation": "process" """
+    return ProcessServiceProxy(plugin_id, module_path, class_name, workers or DEFAULT_WORKERS)
@@ -4,9 +4,15 @@ SQLite-based storage for notes
 """
 import sqlite3
 import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence
+
+from tracing import traced
+
+NOTE_CACHE_SIZE = 256
 
 
 class NotesDatabase:
@@ -15,6 +21,9 @@ class NotesDatabase:
     def __init__(self, db_path: str = "~/.aigem2/knowledge_base.db"):
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Hydrated notes shared by every session using this service
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._init_database()
     
     def _init_database(self):
@@ -68,23 +77,80 @@ class NotesDatabase:
     
     def get_note(self, note_id: int) -> Optional[Dict]:
         """Get note by ID"""
+        notes = self.get_notes([note_id])
+        return notes[0] if notes else None
+    
+    @traced()
+    def get_notes(self, note_ids: Sequence[int]) -> List[Dict]:
+        """Hydrate notes by ID (in the given order) through the shared cache"""
+        found = {}
+        with self._cache_lock:
+            for note_id in note_ids:
+                if note_id in self._cache:
+                    self._cache.move_to_end(note_id)
+                    found[note_id] = self._cache[note_id]
+        
+        missing = [note_id for note_id in note_ids if note_id not in found]
+        if missing:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            placeholders = ", ".join("?" for _ in missing)
+            cursor.execute(f"""
+                SELECT * FROM notes WHERE id IN ({placeholders}) AND is_deleted = 0
+            """, missing)
+            
+            rows = cursor.fetchall()
+            conn.close()
+            
+            with self._cache_lock:
+                for row in rows:
+                    note = dict(row)
+                    note['tags'] = json.loads(note['tags'])
+                    found[note['id']] = note
+                    self._cache[note['id']] = note
+                while len(self._cache) > NOTE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        
+        # Copies, so callers can't mutate the shared cache
+        return [dict(found[note_id]) for note_id in note_ids if note_id in found]
+    
+    @traced()
+    def get_note_ids(self, folder: str = None, limit: int = -1, offset: int = 0) -> List[int]:
+        """IDs of notes, most recently updated first"""
         conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT * FROM notes WHERE id = ? AND is_deleted = 0
-        """, (note_id,))
+        if folder:
+            cursor.execute("""
+                SELECT id FROM notes WHERE folder = ? AND is_deleted = 0
+                ORDER BY updated_at DESC LIMIT ? OFFSET ?
+            """, (folder, limit, offset))
+        else:
+            cursor.execute("""
+                SELECT id FROM notes WHERE is_deleted = 0
+                ORDER BY updated_at DESC LIMIT ? OFFSET ?
+            """, (limit, offset))
         
-        row = cursor.fetchone()
+        ids = [row[0] for row in cursor.fetchall()]
         conn.close()
         
-        if row:
-            note = dict(row)
-            note['tags'] = json.loads(note['tags'])
-            return note
-        return None
+        return ids
     
+    @traced()
+    def count_notes(self) -> int:
+        """Number of notes that aren't deleted"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT COUNT(*) FROM notes WHERE is_deleted = 0")
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    @traced()
     def get_all_notes(self, folder: str = None) -> List[Dict]:
         """Get all notes (optionally filtered by folder)"""
         conn = sqlite3.connect(self.db_path)
@@ -141,6 +207,8 @@ class NotesDatabase:
         
         conn.commit()
         conn.close()
+        
+        self._invalidate(note_id)
     
     def delete_note(self, note_id: int):
         """Soft delete note"""
@@ -153,7 +221,14 @@ class NotesDatabase:
         
         conn.commit()
         conn.close()
+        
+        self._invalidate(note_id)
+    
+    def _invalidate(self, note_id: int):
+        with self._cache_lock:
+            self._cache.pop(note_id, None)
     
+    @traced()
     def search_notes(self, query: str) -> List[Dict]:
         """Search notes by title or content"""
         conn = sqlite3.connect(self.db_path)
@@ -176,4 +251,22 @@ class NotesDatabase:
             note['tags'] = json.loads(note['tags'])
             notes.append(note)
         
-        return notes
\ No newline at end of file
+        return notes
+    
+    @traced()
+    def search_note_ids(self, query: str) -> List[int]:
+        """IDs of notes matching title or content"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        search_term = f"%{query}%"
+        cursor.execute("""
+            SELECT id FROM notes 
+            WHERE (title LIKE ? OR content LIKE ?) AND is_deleted = 0
+            ORDER BY updated_at DESC
+        """, (search_term, search_term))
+        
+        ids = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        
+        return ids
\ No newline at end of file
@@ -5,14 +5,21 @@ Streamlit interface for note-taking
 import streamlit as st
 from modules.knowledge_base.database import NotesDatabase
 from i18n.loader import get_text
+from ui.components.fragment import fragment, rerun_fragment
+from ui.perf import measure_interaction, measure_payload, trace_rerun
+from ui import session_state
+
+PAGE_SIZE = 20
+SEARCH_KEY = "kb_search_ids"
+LIST_KEY = "kb_notes"
 
 class KnowledgeBaseUI:
     """Knowledge Base user interface"""
     
-    def __init__(self, config, license_tier: str):
+    def __init__(self, config, license_tier: str, service: NotesDatabase = None):
         self.config = config
         self.license_tier = license_tier
-        self.db = NotesDatabase()
+        self.db = service or NotesDatabase()
         
         # Initialize session state
         if 'current_note_id' not in st.session_state:
@@ -24,44 +31,91 @@ class KnowledgeBaseUI:
         """Render main UI"""
         st.title("📚 " + get_text("knowledge_base"))
         
-        # Top action bar
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            search_query = st.text_input(
-                get_text("search"),
-                placeholder="Search notes...",
-                label_visibility="collapsed"
-            )
+        self._render_notes_panel()
+    
+    @fragment
+    def _render_notes_panel(self):
+        """Search bar plus note list/editor; interactions here rerun only this panel"""
+        with measure_interaction("fragment:knowledge_base"), measure_payload("fragment:knowledge_base"), trace_rerun("fragment:knowledge_base"):
+            # Top action bar
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                search_query = st.text_input(
+                    get_text("search"),
+                    placeholder="Search notes...",
+                    label_visibility="collapsed"
+                )
+            
+            with col2:
+                if st.button("🔍 " + get_text("search"), use_container_width=True):
+                    if search_query:
+                        session_state.store_ids(SEARCH_KEY, self.db.search_note_ids(search_query))
+                        session_state.set_cursor(LIST_KEY, 0)
+            
+            with col3:
+                st.button("➕ " + get_text("new_note"), use_container_width=True,
+                          on_click=self._open_editor, args=(None,))
+            
+            st.divider()
+            
+            # Show note editor or note list
+            if st.session_state.show_note_editor:
+                self._render_note_editor()
+            else:
+                self._render_note_list()
+    
+    def _open_editor(self, note_id):
+        """Button callback: open the editor (runs before the fragment rerun)"""
+        st.session_state.current_note_id = note_id
+        st.session_state.show_note_editor = True
+    
+    def _close_editor(self):
+        """Button callback: return to the note list"""
+        st.session_state.show_note_editor = False
+        st.session_state.current_note_id = None
+    
+    def _delete_note(self, note_id):
+        """Button callback: soft delete a note"""
+        self.db.delete_note(note_id)
+        st.session_state.note_deleted = True
+    
+    def _render_note_list(self):
+        """Render list of notes""" 
         
-        with col2:
-            if st.button("🔍 " + get_text("search"), use_container_width=True):
-                if search_query:
-                    st.session_state.search_results = self.db.search_notes(search_query)
+        # Session keeps only IDs and a page cursor; rows come from the shared cache
+        offset = session_state.get_cursor(LIST_KEY)
+        search_ids = session_state.get_ids(SEARCH_KEY)
         
-        with col3:
-            if st.button("➕ " + get_text("new_note"), use_container_width=True):
-                st.session_state.show_note_editor = True
-                st.session_state.current_note_id = None
-                st.rerun()
+        if search_ids is not None:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                found = session_state.get_total(SEARCH_KEY)
+                if found > len(search_ids):
+                    st.info(f"Found {found} note(s), showing the first {len(search_ids)}; refine the search to see the rest")
+                else:
+                    st.info(f"Found {found} note(s)")
+            with col2:
+                st.button("✖️ Clear", use_container_width=True,
+                          on_click=session_state.clear, args=(SEARCH_KEY, LIST_KEY))
+            total = len(search_ids)
+        else:
+            total = self.db.count_notes()
         
-        st.divider()
+        # Deleting the last note on a page moves back a page
+        if offset >= total > 0:
+            offset = (total - 1) // PAGE_SIZE * PAGE_SIZE
+            session_state.set_cursor(LIST_KEY, offset)
         
-        # Show note editor or note list
-        if st.session_state.show_note_editor:
-            self._render_note_editor()
+        if search_ids is not None:
+            page_ids = list(search_ids[offset:offset + PAGE_SIZE])
         else:
-            self._render_note_list()
-    
-    def _render_note_list(self):
-        """Render list of notes""" 
+            page_ids = self.db.get_note_ids(limit=PAGE_SIZE, offset=offset)
         
-        # Check if showing search results
-        if hasattr(st.session_state, 'search_results'):
-            notes = st.session_state.search_results
-            st.info(f"Found {len(notes)} note(s)")
-        else:
-            notes = self.db.get_all_notes()
+        notes = self.db.get_notes(page_ids)
+        
+        if st.session_state.pop("note_deleted", False):
+            st.success("Note deleted!")
         
         if not notes:
             st.info(get_text("notes_empty"))
@@ -88,17 +142,31 @@ class KnowledgeBaseUI:
                     st.caption(f"Updated: {note['updated_at']}")
                 
                 with col2:
-                    if st.button("✏️", key=f"edit_{note['id']}"):
-                        st.session_state.current_note_id = note['id']
-                        st.session_state.show_note_editor = True
-                        st.rerun()
+                    st.button("✏️", key=f"edit_{note['id']}",
+                              on_click=self._open_editor, args=(note['id'],))
                     
-                    if st.button("🗑️", key=f"delete_{note['id']}"):
-                        self.db.delete_note(note['id'])
-                        st.success("Note deleted!")
-                        st.rerun()
+                    st.button("🗑️", key=f"delete_{note['id']}",
+                              on_click=self._delete_note, args=(note['id'],))
                 
                 st.divider()
+        
+        if total > PAGE_SIZE:
+            self._render_pager(offset, total)
+    
+    def _render_pager(self, offset: int, total: int):
+        """Previous/next page buttons"""
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col1:
+            st.button("◀", key="kb_prev_page", disabled=offset == 0, use_container_width=True,
+                      on_click=session_state.set_cursor, args=(LIST_KEY, offset - PAGE_SIZE))
+        
+        with col2:
+            st.caption(f"{offset + 1}–{min(offset + PAGE_SIZE, total)} of {total}")
+        
+        with col3:
+            st.button("▶", key="kb_next_page", disabled=offset + PAGE_SIZE >= total, use_container_width=True,
+                      on_click=session_state.set_cursor, args=(LIST_KEY, offset + PAGE_SIZE))
     
     def _render_note_editor(self):
         """Render note editor""" 
@@ -155,16 +223,14 @@ class KnowledgeBaseUI:
                         note_id = self.db.create_note(title, content, tags=tags)
                         st.success(f"Note created! (ID: {note_id})")
                     
-                    st.session_state.show_note_editor = False
-                    st.session_state.current_note_id = None
-                    st.rerun()
+                    self._close_editor()
+                    rerun_fragment()
                 else:
                     st.error("Title is required!")
             
             if cancelled:
-                st.session_state.show_note_editor = False
-                st.session_state.current_note_id = None
-                st.rerun()
+                self._close_editor()
+                rerun_fragment()
     
     def cleanup(self):
         """Cleanup resources"""
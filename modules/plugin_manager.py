@@ -2,10 +2,15 @@
 Plugin Manager
 Dynamic module loading system
 """
-import json
 import importlib
-from pathlib import Path
+import sys
 from typing import Dict, Optional, Any
+from modules.registry import get_plugin_registry
+from modules.runtime import get_plugin_runtime, DEFAULT_MEMORY_BUDGET_MB
+from modules.warmup import navigation_stats, plugin_warmer
+from modules.profiling import plugin_profiler, IMPORT, SERVICE_INIT, CONSTRUCT, RENDER
+from entitlements import get_entitlements
+from tracing import traced
 
 class PluginManager:
     """Manage plugin modules with lazy loading"""
@@ -13,37 +18,43 @@ class PluginManager:
     def __init__(self, config, license_tier: str):
         self.config = config
         self.license_tier = license_tier
+        self.entitlements = get_entitlements(config, license_tier)
         self.loaded_plugins = {}
-        self.plugin_registry = {}
-        self._scan_plugins()
-    
-    def _scan_plugins(self):
-        """Scan modules directory for available plugins"""
-        modules_dir = Path(__file__).parent
+        self.registry = get_plugin_registry()
+        self.runtime = get_plugin_runtime(
+            getattr(config, "PLUGIN_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB)
+        )
+        self._loaded_generations = {}
         
-        for plugin_dir in modules_dir.iterdir():
-            if plugin_dir.is_dir() and not plugin_dir.name.startswith('_'):
-                plugin_json = plugin_dir / "plugin.json"
-                
-                if plugin_json.exists():
-                    with open(plugin_json, 'r') as f:
-                        metadata = json.load(f)
-                        self.plugin_registry[plugin_dir.name] = {
-                            "path": plugin_dir,
-                            "metadata": metadata
-                        }
+        # Development mode: watch modules/ and reload changed plugins in place
+        self.reloader = None
+        if getattr(config, "PLUGIN_HOT_RELOAD", False):
+            from modules.hot_reload import get_plugin_reloader
+            self.reloader = get_plugin_reloader(self.registry, self.runtime)
+    
+    @property
+    def plugin_registry(self) -> Dict[str, Dict[str, Any]]:
+        """Available plugins (shared, cached registry)"""
+        return self.registry.plugins()
     
     def get_plugin_metadata(self, plugin_id: str) -> Optional[Dict[str, Any]]:
         """Get plugin metadata"""
-        plugin_info = self.plugin_registry.get(plugin_id)
-        return plugin_info["metadata"] if plugin_info else None
+        return self.registry.get_metadata(plugin_id)
     
+    @traced()
     def load_plugin(self, plugin_id: str):
         """Load plugin module dynamically"""
         
         # Check if already loaded
+        generation = self.reloader.generation(plugin_id) if self.reloader else 0
         if plugin_id in self.loaded_plugins:
-            return self.loaded_plugins[plugin_id]
+            if self._loaded_generations.get(plugin_id) == generation:
+                return self.loaded_plugins[plugin_id]
+            
+            # Plugin was hot-reloaded since this instance was built
+            stale = self.loaded_plugins.pop(plugin_id)
+            if hasattr(stale, 'cleanup'):
+                stale.cleanup()
         
         # Get plugin info
         plugin_info = self.plugin_registry.get(plugin_id)
@@ -54,22 +65,33 @@ class PluginManager:
         
         # Check tier requirement
         tier_required = metadata.get("tier_required", "FREE")
-        if not self._check_tier_access(tier_required):
+        if not self.entitlements.tier_at_least(tier_required):
             return None
         
         # Dynamic import
         try:
-            entry_point = metadata.get("entry_point", "ui.py:PluginUI")
-            module_name, class_name = entry_point.split(":")
+            plugin_class = self._import_entry_point(plugin_id, metadata.get("entry_point", "ui.py:PluginUI"))
             
-            module_path = f"modules.{plugin_id}.{module_name.replace('.py', '')}"
-            module = importlib.import_module(module_path)
+            # Heavy services are shared across reruns and sessions; the UI object is per-session
+            service = None
+            if metadata.get("service"):
+                factory = self._service_factory(plugin_id, metadata)
+                
+                def timed_factory():
+                    with plugin_profiler.measure(plugin_id, SERVICE_INIT):
+                        return factory()
+                
+                service = self.runtime.get_service(plugin_id, timed_factory, metadata.get("memory_mb"))
             
-            plugin_class = getattr(module, class_name)
-            plugin_instance = plugin_class(self.config, self.license_tier)
+            with plugin_profiler.measure(plugin_id, CONSTRUCT):
+                if service is not None:
+                    plugin_instance = plugin_class(self.config, self.license_tier, service=service)
+                else:
+                    plugin_instance = plugin_class(self.config, self.license_tier)
             
             # Cache loaded plugin
             self.loaded_plugins[plugin_id] = plugin_instance
+            self._loaded_generations[plugin_id] = generation
             
             return plugin_instance
             
@@ -77,21 +99,78 @@ class PluginManager:
             print(f"Failed to load plugin {plugin_id}: {e}")
             return None
     
+    def _import_entry_point(self, plugin_id: str, entry_point: str):
+        """Resolve 'module.py:ClassName' inside a plugin package"""
+        class_name = entry_point.split(":")[1]
+        module_path = self._module_path(plugin_id, entry_point)
+        
+        # Only cold imports are worth a sample; cached ones are a dict lookup
+        if module_path in sys.modules:
+            module = sys.modules[module_path]
+        else:
+            with plugin_profiler.measure(plugin_id, IMPORT):
+                module = importlib.import_module(module_path)
+        
+        return getattr(module, class_name)
+    
+    def _service_factory(self, plugin_id: str, metadata: Dict[str, Any]):
+        """Factory for a plugin's shared service (in-process or in worker processes)"""
+        if metadata.get("isolation") == "process":
+            from modules.isolation import create_process_service
+            module_path = self._module_path(plugin_id, metadata["service"])
+            class_name = metadata["service"].split(":")[1]
+            return lambda: create_process_service(
+                plugin_id, module_path, class_name, metadata.get("workers")
+            )
+        
+        return self._import_entry_point(plugin_id, metadata["service"])
+    
+    def _module_path(self, plugin_id: str, entry_point: str) -> str:
+        """Dotted module path for a plugin entry point"""
+        module_name = entry_point.split(":")[0]
+        return f"modules.{plugin_id}.{module_name.replace('.py', '')}"
+    
+    def record_navigation(self, plugin_id: str):
+        """Record a plugin page visit (drives warm-up priority)"""
+        navigation_stats.record(plugin_id)
+    
+    def warm_up(self):
+        """Import plugins this tier can reach in the background, most visited first"""
+        reachable = [
+            plugin_id for plugin_id, plugin_info in self.plugin_registry.items()
+            if self.entitlements.tier_at_least(plugin_info["metadata"].get("tier_required", "FREE"))
+        ]
+        
+        module_paths = []
+        for plugin_id in navigation_stats.rank(reachable):
+            metadata = self.get_plugin_metadata(plugin_id)
+            for field in ("service", "entry_point"):
+                # Process-isolated services are imported by their workers, not here
+                if field == "service" and metadata.get("isolation") == "process":
+                    continue
+                if metadata.get(field):
+                    module_paths.append(self._module_path(plugin_id, metadata[field]))
+        
+        plugin_warmer.warm(module_paths)
+    
+    @traced()
+    def render_plugin(self, plugin_id: str, plugin):
+        """Render a loaded plugin, recording wall and CPU time"""
+        with plugin_profiler.measure(plugin_id, RENDER):
+            plugin.render_ui()
+    
     def unload_plugin(self, plugin_id: str):
-        """Unload plugin from memory"""
+        """Unload plugin and its shared service from memory"""
         if plugin_id in self.loaded_plugins:
             plugin = self.loaded_plugins[plugin_id]
             if hasattr(plugin, 'cleanup'):
                 plugin.cleanup()
             del self.loaded_plugins[plugin_id]
+        self.runtime.unload(plugin_id)
     
-    def _check_tier_access(self, required_tier: str) -> bool:
-        """Check tier access"""
-        tier_hierarchy = ["FREE", "STARTER", "PRO", "PREMIUM"]
-        
-        try:
-            current_index = tier_hierarchy.index(self.license_tier)
-            required_index = tier_hierarchy.index(required_tier)
-            return current_index >= required_index
-        except ValueError:
-            return False
\ No newline at end of file
+    def cleanup(self):
+        """Release this session's plugin instances (shared services stay loaded)"""
+        for plugin_id, plugin in list(self.loaded_plugins.items()):
+            if hasattr(plugin, 'cleanup'):
+                plugin.cleanup()
+        self.loaded_plugins.clear()
@@ -0,0 +1,102 @@
+"""
+Plugin Profiler
+Import, construction and render timings for every plugin, kept in a ring buffer
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Any
+
+DEFAULT_CAPACITY = 1000
+
+# Phases recorded by PluginManager
+IMPORT = "import"
+SERVICE_INIT = "service_init"
+CONSTRUCT = "construct"
+RENDER = "render"
+
+
+class PluginProfiler:
+    """Thread-safe ring buffer of plugin timing samples"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._samples = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, plugin_id: str, phase: str):
+        """Record wall and CPU time of the enclosed block"""
+        wall_start = time.perf_counter()
+        # Per-thread CPU time: each Streamlit session renders on its own thread
+        cpu_start = time.thread_time()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(
+                plugin_id,
+                phase,
+                (time.perf_counter() - wall_start) * 1000,
+                (time.thread_time() - cpu_start) * 1000,
+                ok
+            )
+
+    def record(self, plugin_id: str, phase: str, wall_ms: float, cpu_ms: float, ok: bool = True):
+        """Append one sample"""
+        with self._lock:
+            self._samples.append({
+                "plugin_id": plugin_id,
+                "phase": phase,
+                "wall_ms": round(wall_ms, 3),
+                "cpu_ms": round(cpu_ms, 3),
+                "ok": ok,
+                "timestamp": time.time()
+            })
+
+    def samples(self, plugin_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded samples, oldest first"""
+        with self._lock:
+            samples = list(self._samples)
+        if plugin_id:
+            samples = [s for s in samples if s["plugin_id"] == plugin_id]
+        return samples
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Count, mean, p95 and max per (plugin, phase)"""
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for sample in self.samples():
+            groups.setdefault((sample["plugin_id"], sample["phase"]), []).append(sample)
+
+        rows = []
+        for (plugin_id, phase), samples in sorted(groups.items()):
+            walls = sorted(s["wall_ms"] for s in samples)
+            rows.append({
+                "plugin_id": plugin_id,
+                "phase": phase,
+                "count": len(samples),
+                "last_wall_ms": samples[-1]["wall_ms"],
+                "mean_wall_ms": round(sum(walls) / len(walls), 3),
+                "p95_wall_ms": walls[min(int(len(walls) * 0.95), len(walls) - 1)],
+                "max_wall_ms": walls[-1],
+                "mean_cpu_ms": round(sum(s["cpu_ms"] for s in samples) / len(samples), 3),
+                "failures": sum(1 for s in samples if not s["ok"])
+            })
+        return rows
+
+    def export_json(self) -> str:
+        """Summary plus raw samples as JSON"""
+        return json.dumps({
+            "exported_at": time.time(),
+            "summary": self.summary(),
+            "samples": self.samples()
+        }, indent=2)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+plugin_profiler = PluginProfiler()
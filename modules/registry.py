@@ -0,0 +1,170 @@
+"""
+Plugin Registry
+Process-wide cache of plugin manifests, rebuilt only when a plugin.json changes
+"""
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+
+TIER_HIERARCHY = ["FREE", "STARTER", "PRO", "PREMIUM"]
+
+# field -> (type, required)
+MANIFEST_SCHEMA = {
+    "id": (str, True),
+    "name": (str, True),
+    "version": (str, True),
+    "entry_point": (str, True),
+    "tier_required": (str, False),
+    "description": (str, False),
+    "dependencies": (list, False),
+    "author": (str, False),
+    "icon": (str, False),
+    "service": (str, False),
+    "memory_mb": (int, False),
+    "isolation": (str, False),
+    "workers": (int, False),
+}
+
+ISOLATION_MODES = ("none", "process")
+
+ENTRY_POINT_RE = re.compile(r"^[A-Za-z_][\w]*(\.py)?:[A-Za-z_]\w*$")
+
+
+class PluginManifestError(ValueError):
+    """Raised when a plugin.json does not match the manifest schema"""
+
+
+def validate_manifest(manifest: Any, plugin_dir_name: str) -> Dict[str, Any]:
+    """Validate a parsed plugin.json against MANIFEST_SCHEMA"""
+    if not isinstance(manifest, dict):
+        raise PluginManifestError("manifest must be a JSON object")
+
+    for field, (field_type, required) in MANIFEST_SCHEMA.items():
+        if field not in manifest:
+            if required:
+                raise PluginManifestError(f"missing required field '{field}'")
+            continue
+        if not isinstance(manifest[field], field_type):
+            raise PluginManifestError(
+                f"field '{field}' must be of type {field_type.__name__}"
+            )
+
+    if manifest["id"] != plugin_dir_name:
+        raise PluginManifestError(
+            f"id '{manifest['id']}' does not match directory '{plugin_dir_name}'"
+        )
+
+    for field in ("entry_point", "service"):
+        if field in manifest and not ENTRY_POINT_RE.match(manifest[field]):
+            raise PluginManifestError(f"{field} must look like 'module.py:ClassName'")
+
+    if manifest.get("isolation", "none") not in ISOLATION_MODES:
+        raise PluginManifestError(f"isolation must be one of {', '.join(ISOLATION_MODES)}")
+
+    if manifest.get("isolation") == "process" and "service" not in manifest:
+        raise PluginManifestError("process isolation requires a 'service' entry point")
+
+    tier = manifest.get("tier_required", "FREE")
+    if tier not in TIER_HIERARCHY:
+        raise PluginManifestError(f"unknown tier_required '{tier}'")
+
+    return manifest
+
+
+class PluginRegistry:
+    """Validated plugin manifests keyed by plugin id"""
+
+    CHECK_INTERVAL = 2.0
+
+    def __init__(self, modules_dir: Path):
+        self.modules_dir = Path(modules_dir)
+        self._lock = threading.Lock()
+        self._plugins: Dict[str, Dict[str, Any]] = {}
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+
+    def plugins(self) -> Dict[str, Dict[str, Any]]:
+        """All valid plugins as {plugin_id: {"path", "metadata"}}"""
+        self._ensure_fresh()
+        return self._plugins
+
+    def get(self, plugin_id: str) -> Optional[Dict[str, Any]]:
+        """Registry entry for a plugin"""
+        return self.plugins().get(plugin_id)
+
+    def get_metadata(self, plugin_id: str) -> Optional[Dict[str, Any]]:
+        """Manifest for a plugin"""
+        plugin_info = self.plugins().get(plugin_id)
+        return plugin_info["metadata"] if plugin_info else None
+
+    def invalidate(self):
+        """Force a rebuild on next access"""
+        with self._lock:
+            self._signature = None
+            self._checked_at = 0.0
+
+    def _ensure_fresh(self):
+        """Rebuild if any manifest was added, removed or modified"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < self.CHECK_INTERVAL:
+            return
+
+        with self._lock:
+            if self._signature is not None and now - self._checked_at < self.CHECK_INTERVAL:
+                return
+
+            signature = self._manifest_signature()
+            if signature != self._signature:
+                self._plugins = self._build(signature)
+                self._signature = signature
+            self._checked_at = now
+
+    def _manifest_signature(self) -> Tuple:
+        """(dir name, mtime, size) for every plugin.json"""
+        entries = []
+        with os.scandir(self.modules_dir) as it:
+            for entry in it:
+                if not entry.is_dir() or entry.name.startswith('_'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(entry.path, "plugin.json"))
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
+    def _build(self, signature: Tuple) -> Dict[str, Dict[str, Any]]:
+        """Parse and validate every manifest"""
+        plugins = {}
+        for name, _, _ in signature:
+            plugin_dir = self.modules_dir / name
+            try:
+                with open(plugin_dir / "plugin.json", 'r') as f:
+                    metadata = validate_manifest(json.load(f), name)
+            except (OSError, ValueError) as e:
+                print(f"Invalid plugin manifest {name}: {e}")
+                continue
+
+            plugins[name] = {
+                "path": plugin_dir,
+                "metadata": metadata
+            }
+        return plugins
+
+
+_registry: Optional[PluginRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_plugin_registry() -> PluginRegistry:
+    """Process-wide registry for the modules/ directory"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PluginRegistry(Path(__file__).parent)
+    return _registry
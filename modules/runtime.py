@@ -0,0 +1,139 @@
+"""
+Plugin Runtime
+Process-wide, thread-safe cache of plugin services with LRU unloading
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Any
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+DEFAULT_SERVICE_MEMORY_MB = 32
+
+MB = 1024 * 1024
+
+
+class PluginRuntime:
+    """Keep heavy plugin services alive across reruns and sessions"""
+
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget = memory_budget_mb * MB
+        self._lock = threading.RLock()
+        self._services: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loading_locks: Dict[str, threading.Lock] = {}
+
+    def get_service(self, plugin_id: str, factory: Callable[[], Any],
+                    memory_mb: Optional[int] = None) -> Any:
+        """Return the shared service for a plugin, constructing it at most once"""
+        with self._lock:
+            entry = self._touch(plugin_id)
+            if entry is not None:
+                return entry["service"]
+            loading_lock = self._loading_locks.setdefault(plugin_id, threading.Lock())
+
+        # Construct outside the runtime lock so other plugins stay available
+        with loading_lock:
+            with self._lock:
+                entry = self._touch(plugin_id)
+                if entry is not None:
+                    return entry["service"]
+
+            service = factory()
+            memory = self._estimate_memory(service, memory_mb)
+
+            with self._lock:
+                self._services[plugin_id] = {
+                    "service": service,
+                    "memory": memory,
+                    "loaded_at": time.time(),
+                    "last_used": time.time()
+                }
+                self._evict(keep=plugin_id)
+
+        return service
+
+    def unload(self, plugin_id: str):
+        """Drop a plugin's service and call its cleanup hook"""
+        with self._lock:
+            entry = self._services.pop(plugin_id, None)
+
+        if entry is not None:
+            self._cleanup_service(plugin_id, entry["service"])
+
+    def cleanup(self):
+        """Unload every service"""
+        with self._lock:
+            plugin_ids = list(self._services)
+
+        for plugin_id in plugin_ids:
+            self.unload(plugin_id)
+
+    def set_memory_budget(self, memory_budget_mb: int):
+        """Change the budget and evict down to it"""
+        with self._lock:
+            self.memory_budget = memory_budget_mb * MB
+            self._evict()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Loaded services in LRU order (least recently used first)"""
+        with self._lock:
+            return {
+                plugin_id: {
+                    "memory_mb": entry["memory"] / MB,
+                    "loaded_at": entry["loaded_at"],
+                    "last_used": entry["last_used"]
+                }
+                for plugin_id, entry in self._services.items()
+            }
+
+    def _touch(self, plugin_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a service as most recently used (caller holds the lock)"""
+        entry = self._services.get(plugin_id)
+        if entry is not None:
+            entry["last_used"] = time.time()
+            self._services.move_to_end(plugin_id)
+        return entry
+
+    def _estimate_memory(self, service: Any, memory_mb: Optional[int]) -> int:
+        """Bytes attributed to a service for budget accounting"""
+        if hasattr(service, "memory_usage"):
+            try:
+                return int(service.memory_usage())
+            except Exception as e:
+                print(f"memory_usage() failed for {type(service).__name__}: {e}")
+        return (memory_mb or DEFAULT_SERVICE_MEMORY_MB) * MB
+
+    def _evict(self, keep: Optional[str] = None):
+        """Unload least recently used services until under budget (caller holds the lock)"""
+        total = sum(entry["memory"] for entry in self._services.values())
+
+        for plugin_id in list(self._services):
+            if total <= self.memory_budget:
+                break
+            if plugin_id == keep:
+                continue
+
+            entry = self._services.pop(plugin_id)
+            total -= entry["memory"]
+            self._cleanup_service(plugin_id, entry["service"])
+
+    def _cleanup_service(self, plugin_id: str, service: Any):
+        if hasattr(service, 'cleanup'):
+            try:
+                service.cleanup()
+            except Exception as e:
+                print(f"Cleanup failed for plugin {plugin_id}: {e}")
+
+
+_runtime: Optional[PluginRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_plugin_runtime(memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB) -> PluginRuntime:
+    """Process-wide plugin runtime"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = PluginRuntime(memory_budget_mb)
+    return _runtime
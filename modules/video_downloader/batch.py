@@ -0,0 +1,166 @@
+"""
+Batch URL Ingestion
+Parse, normalize and enqueue many video URLs at once
+"""
+import csv
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change which video is downloaded
+TRACKING_PARAMS = {"si", "feature", "fbclid", "gclid", "igshid", "ref", "ref_src"}
+
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+YOUTUBE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+HOSTNAME_RE = re.compile(r"^[a-z0-9.-]+\.[a-z]{2,}$")
+
+NORMALIZE_WORKERS = 8
+METADATA_WORKERS = 4
+
+
+def parse_batch_input(text: str) -> List[str]:
+    """Split pasted text or CSV content into candidate URL entries"""
+    entries = []
+
+    for index, row in enumerate(csv.reader(io.StringIO(text))):
+        cells = [cell.strip().strip('"\'') for cell in row if cell.strip()]
+        if not cells or cells[0].startswith("#"):
+            continue
+
+        # CSV rows may carry extra columns (title, notes...); pick the URL-looking one
+        url_cells = [cell for cell in cells if "://" in cell or cell.startswith("www.")]
+        if index == 0 and not url_cells and len(cells) > 1:
+            continue  # CSV header row
+        entries.append(url_cells[0] if url_cells else cells[0])
+
+    return entries
+
+
+def normalize_url(entry: str) -> Tuple[Optional[str], Optional[str]]:
+    """Validate and canonicalize a URL, returning (url, error)"""
+    candidate = entry.strip()
+
+    if not candidate:
+        return None, "Empty entry"
+
+    if any(ch.isspace() for ch in candidate):
+        return None, "URL contains whitespace"
+
+    if "://" not in candidate:
+        candidate = "https://" + candidate
+
+    try:
+        parts = urlsplit(candidate)
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return None, "Malformed URL"
+
+    if parts.scheme.lower() not in ("http", "https"):
+        return None, f"Unsupported scheme: {parts.scheme}"
+
+    if not HOSTNAME_RE.match(host):
+        return None, "Invalid host"
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+
+    # Canonicalize the common YouTube URL shapes to watch?v=<id>
+    video_id = None
+    if host == "youtu.be":
+        video_id = parts.path.strip("/").split("/")[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path == "/watch":
+            video_id = dict(query).get("v")
+        elif parts.path.startswith(("/shorts/", "/embed/", "/live/")):
+            video_id = parts.path.split("/")[2]
+
+    if video_id is not None:
+        if not YOUTUBE_ID_RE.match(video_id):
+            return None, "Invalid YouTube video ID"
+        return f"https://www.youtube.com/watch?v={video_id}", None
+
+    netloc = host if port is None else f"{host}:{port}"
+    path = parts.path or "/"
+    return urlunsplit(("https" if parts.scheme.lower() == "https" else "http",
+                       netloc, path, urlencode(sorted(query)), "")), None
+
+
+class BatchIngestor:
+    """Validate, resolve and enqueue a batch of URLs"""
+
+    def __init__(self, downloader, database):
+        self.downloader = downloader
+        self.database = database
+
+    def ingest(self, entries: List[str], resolve_metadata: bool = True,
+               mode: str = "video") -> Dict[str, Any]:
+        """Ingest entries and return a summary of accepted/duplicate/invalid URLs"""
+        invalid = []
+        duplicates = []
+        unique_urls = []
+        seen = set()
+
+        # Validate and normalize in a thread pool
+        with ThreadPoolExecutor(max_workers=NORMALIZE_WORKERS) as pool:
+            results = list(pool.map(normalize_url, entries))
+
+        for entry, (url, error) in zip(entries, results):
+            if error:
+                invalid.append({"entry": entry, "reason": error})
+            elif url in seen:
+                duplicates.append(url)
+            else:
+                seen.add(url)
+                unique_urls.append(url)
+
+        # Skip URLs that are already queued before paying for extraction
+        existing = set(self.database.get_existing_urls(unique_urls))
+        duplicates.extend(url for url in unique_urls if url in existing)
+        new_urls = [url for url in unique_urls if url not in existing]
+
+        jobs = []
+        if resolve_metadata:
+            with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as pool:
+                resolved = list(pool.map(self._resolve, new_urls))
+
+            for url, (info, error) in zip(new_urls, resolved):
+                if error:
+                    invalid.append({"entry": url, "reason": error})
+                else:
+                    jobs.append(self._build_job(url, info, mode))
+        else:
+            jobs = [self._build_job(url, None, mode) for url in new_urls]
+
+        # Enqueue everything in one transaction
+        result = self.database.enqueue_jobs(jobs)
+        duplicates.extend(result["duplicates"])
+
+        return {
+            "accepted": result["accepted"],
+            "duplicates": duplicates,
+            "invalid": invalid
+        }
+
+    def _resolve(self, url: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Resolve metadata for one URL"""
+        try:
+            return self.downloader.get_video_info(url), None
+        except Exception as e:
+            return None, f"Metadata lookup failed: {e}"
+
+    def _build_job(self, url: str, info: Optional[Dict], mode: str) -> Dict[str, Any]:
+        """Build a queue row from resolved metadata"""
+        info = info or {}
+        return {
+            "url": url,
+            "title": info.get("title"),
+            "duration": info.get("duration"),
+            "filesize": info.get("filesize"),
+            "info": info or None,
+            "mode": mode
+        }
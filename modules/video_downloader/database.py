@@ -0,0 +1,270 @@
+"""
+Video Downloader Database
+SQLite-based download queue and media catalog
+"""
+import sqlite3
+import json
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+
+class DownloadsDatabase:
+    """Manage queued download jobs in SQLite database"""
+
+    def __init__(self, db_path: str = "~/.aigem2/video_downloader.db"):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS download_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT,
+                duration INTEGER,
+                filesize INTEGER,
+                info TEXT,
+                mode TEXT DEFAULT 'video',
+                status TEXT DEFAULT 'pending',
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS media_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                title TEXT,
+                path TEXT,
+                format_id TEXT,
+                filesize INTEGER,
+                thumbnail_hash TEXT,
+                sha256 TEXT,
+                file_mtime_ns INTEGER,
+                verified_at TIMESTAMP,
+                integrity TEXT,
+                downloaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        self._add_missing_columns(cursor, "media_files", {
+            "thumbnail_hash": "TEXT",
+            "sha256": "TEXT",
+            "file_mtime_ns": "INTEGER",
+            "verified_at": "TIMESTAMP",
+            "integrity": "TEXT"
+        })
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_download_jobs_status
+            ON download_jobs (status, id)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Add columns introduced after the table was first created"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def enqueue_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Insert jobs in a single transaction, skipping URLs already queued"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        accepted = []
+        duplicates = []
+
+        try:
+            cursor.execute("BEGIN")
+            for job in jobs:
+                info = job.get("info")
+                cursor.execute("""
+                    INSERT OR IGNORE INTO download_jobs (url, title, duration, filesize, info, mode)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    job["url"],
+                    job.get("title"),
+                    job.get("duration"),
+                    job.get("filesize"),
+                    json.dumps(info) if info else None,
+                    job.get("mode", "video")
+                ))
+
+                if cursor.rowcount:
+                    accepted.append(job["url"])
+                else:
+                    duplicates.append(job["url"])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return {"accepted": accepted, "duplicates": duplicates}
+
+    def get_existing_urls(self, urls: List[str]) -> List[str]:
+        """Return the subset of URLs that already have a job"""
+        if not urls:
+            return []
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        existing = []
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(
+                f"SELECT url FROM download_jobs WHERE url IN ({placeholders})",
+                chunk
+            )
+            existing.extend(row[0] for row in cursor.fetchall())
+
+        conn.close()
+        return existing
+
+    def get_jobs(self, status: str = None, limit: int = 100) -> List[Dict]:
+        """Get jobs (optionally filtered by status)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        if status:
+            cursor.execute("""
+                SELECT * FROM download_jobs WHERE status = ?
+                ORDER BY id LIMIT ?
+            """, (status, limit))
+        else:
+            cursor.execute("""
+                SELECT * FROM download_jobs
+                ORDER BY id DESC LIMIT ?
+            """, (limit,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['info'] = json.loads(job['info']) if job['info'] else None
+            jobs.append(job)
+
+        return jobs
+
+    def get_job_counts(self) -> Dict[str, int]:
+        """Get number of jobs per status"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT status, COUNT(*) FROM download_jobs GROUP BY status
+        """)
+
+        counts = dict(cursor.fetchall())
+        conn.close()
+
+        return counts
+
+    def update_job_status(self, job_id: int, status: str, error: Optional[str] = None):
+        """Update job status"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            UPDATE download_jobs
+            SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, error, job_id))
+
+        conn.commit()
+        conn.close()
+
+    def record_download(self, url: str, title: str = None, path: str = None,
+                        format_id: str = None, filesize: int = None) -> int:
+        """Record a completed download in the media catalog"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO media_files (url, title, path, format_id, filesize)
+            VALUES (?, ?, ?, ?, ?)
+        """, (url, title, path, format_id, filesize))
+
+        media_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+
+        return media_id
+
+    def set_media_thumbnail(self, media_id: int, thumbnail_hash: str):
+        """Attach a cached thumbnail to a catalog entry"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            UPDATE media_files SET thumbnail_hash = ? WHERE id = ?
+        """, (thumbnail_hash, media_id))
+
+        conn.commit()
+        conn.close()
+
+    def get_media_files(self, limit: int = 500) -> List[Dict]:
+        """Get catalog entries, newest first"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT * FROM media_files
+            ORDER BY downloaded_at DESC, id DESC LIMIT ?
+        """, (limit,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [dict(row) for row in rows]
+
+    def record_hashes(self, results: List[Dict[str, Any]]):
+        """Store verification results, adding catalog rows for untracked files"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN")
+            for result in results:
+                if result.get("id") is None:
+                    cursor.execute("""
+                        INSERT INTO media_files (url, title, path)
+                        VALUES (?, ?, ?)
+                    """, (Path(result["path"]).as_uri(), Path(result["path"]).stem, result["path"]))
+                    result["id"] = cursor.lastrowid
+
+                cursor.execute("""
+                    UPDATE media_files
+                    SET sha256 = COALESCE(?, sha256), filesize = COALESCE(?, filesize),
+                        file_mtime_ns = COALESCE(?, file_mtime_ns), integrity = ?,
+                        verified_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (result.get("sha256"), result.get("size"), result.get("mtime_ns"),
+                      result["integrity"], result["id"]))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
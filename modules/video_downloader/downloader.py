@@ -1,19 +1,214 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import yt_dlp
 
+DOWNLOAD_DIR = Path.home() / ".aigem2" / "downloads"
+OUTPUT_TEMPLATE = "%(title).150B [%(id)s].%(ext)s"
+
+# Format fields kept in the info cache (full yt-dlp info dicts are large)
+FORMAT_FIELDS = (
+    'format_id', 'ext', 'width', 'height', 'fps', 'tbr', 'abr', 'vbr',
+    'vcodec', 'acodec', 'filesize', 'filesize_approx'
+)
+
+
+THUMBNAIL_WIDTH = 320
+
+
+def pick_thumbnail(info):
+    """Pick the thumbnail closest to grid size instead of the full-res default"""
+    sized = [t for t in info.get('thumbnails') or [] if t.get('url') and t.get('width')]
+    if sized:
+        return min(sized, key=lambda t: abs(t['width'] - THUMBNAIL_WIDTH))['url']
+    return info.get('thumbnail')
+
+
+def summarize_info(info):
+    """Reduce a yt-dlp info dict to the fields the app needs"""
+    formats = [
+        {key: fmt.get(key) for key in FORMAT_FIELDS}
+        for fmt in info.get('formats') or []
+    ]
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title'),
+        'duration': info.get('duration'),
+        'uploader': info.get('uploader'),
+        'extractor': info.get('extractor_key') or info.get('extractor'),
+        'webpage_url': info.get('webpage_url'),
+        'thumbnail': pick_thumbnail(info),
+        'filesize': info.get('filesize') or info.get('filesize_approx'),
+        # Single-format results (direct files) describe their stream here
+        'height': info.get('height'),
+        'tbr': info.get('tbr'),
+        'vcodec': info.get('vcodec'),
+        'acodec': info.get('acodec'),
+        'formats': formats,
+    }
+
+
 class VideoDownloader:
+    INFO_CACHE_SIZE = 512
+    PREFETCH_WORKERS = 2
+    PREFETCH_DEBOUNCE = 0.4
+    # Failed prefetches aren't retried for this long (offline, unsupported URL)
+    FAILURE_TTL = 300
+    FAILURE_CACHE_SIZE = 128
+
+    # Shared by every instance so prefetched info survives Streamlit reruns
+    _info_cache = OrderedDict()
+    _info_lock = threading.Lock()
+    _inflight = {}
+    _failed = OrderedDict()
+    _latest_request = {}
+    _prefetch_pool = None
+
     def get_video_info(self, url):
-        with yt_dlp.YoutubeDL() as ydl:
-            return ydl.extract_info(url)
+        cached = self.get_cached_info(url)
+        if cached is not None:
+            return cached
+
+        # Join a prefetch that is already extracting this URL
+        with self._info_lock:
+            future = self._inflight.get(url)
+        if future is not None:
+            info = future.result()
+            if info is not None:
+                return info
+
+        return self._extract_info(url)
 
-    def download_video(self, url):
-        with yt_dlp.YoutubeDL() as ydl:
-            ydl.download([url])
+    def prefetch_info(self, url, key=None):
+        """Extract info in the background; only the latest URL per key is fetched"""
+        with self._info_lock:
+            if url in self._info_cache or self._failure(url) is not None:
+                return None
+            self._latest_request[key] = url
+            future = self._inflight.get(url)
+            if future is None:
+                if VideoDownloader._prefetch_pool is None:
+                    VideoDownloader._prefetch_pool = ThreadPoolExecutor(
+                        max_workers=self.PREFETCH_WORKERS, thread_name_prefix="info-prefetch"
+                    )
+                future = self._prefetch_pool.submit(self._prefetch, url, key)
+                self._inflight[url] = future
+            return future
 
-    def download_audio_only(self, url):
-        options = {'format': 'bestaudio'}
+    def get_prefetch(self, url):
+        with self._info_lock:
+            return self._inflight.get(url)
+
+    def get_prefetch_error(self, url):
+        """Error of a recent failed prefetch, or None"""
+        with self._info_lock:
+            return self._failure(url)
+
+    def _failure(self, url):
+        # Caller holds _info_lock
+        failure = self._failed.get(url)
+        if failure is None:
+            return None
+        error, failed_at = failure
+        if time.monotonic() - failed_at > self.FAILURE_TTL:
+            del self._failed[url]
+            return None
+        return error
+
+    def _prefetch(self, url, key):
+        try:
+            # Debounce: skip URLs superseded while the user was still typing
+            time.sleep(self.PREFETCH_DEBOUNCE)
+            with self._info_lock:
+                if self._latest_request.get(key) != url:
+                    return None
+            return self._extract_info(url)
+        except Exception as e:
+            print(f"Prefetch failed for {url}: {e}")
+            with self._info_lock:
+                self._failed[url] = (str(e) or type(e).__name__, time.monotonic())
+                self._failed.move_to_end(url)
+                while len(self._failed) > self.FAILURE_CACHE_SIZE:
+                    self._failed.popitem(last=False)
+            return None
+        finally:
+            with self._info_lock:
+                self._inflight.pop(url, None)
+                # Done with this session's request (unless a newer URL replaced it)
+                if self._latest_request.get(key) == url:
+                    del self._latest_request[key]
+
+    def _extract_info(self, url):
+        options = {'quiet': True, 'no_warnings': True, 'skip_download': True}
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = summarize_info(ydl.extract_info(url, download=False))
+
+        self._cache_info(url, info)
+        return info
+
+    def get_cached_info(self, url):
+        with self._info_lock:
+            info = self._info_cache.get(url)
+            if info is not None:
+                self._info_cache.move_to_end(url)
+            return info
+
+    def _cache_info(self, url, info):
+        with self._info_lock:
+            self._failed.pop(url, None)
+            self._info_cache[url] = info
+            self._info_cache.move_to_end(url)
+            while len(self._info_cache) > self.INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+
+    def download_video(self, url, format_id=None, progress_hook=None):
+        options = self._download_options(format_id, progress_hook)
+        with yt_dlp.YoutubeDL(options) as ydl:
+            return self._download_result(ydl.extract_info(url, download=True))
+
+    def download_audio_only(self, url, format_id=None, progress_hook=None):
+        options = self._download_options(format_id or 'bestaudio', progress_hook)
+        # The planner may pick a muxed format when there is no audio-only
+        # stream; keep just its audio ('best' copies without re-encoding and
+        # leaves files that are already audio-only alone)
+        options['postprocessors'] = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'best'}]
         with yt_dlp.YoutubeDL(options) as ydl:
-            ydl.download([url])
+            return self._download_result(ydl.extract_info(url, download=True))
+
+    def _download_options(self, format_id, progress_hook=None):
+        DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        options = {
+            'quiet': True,
+            'no_warnings': True,
+            'outtmpl': str(DOWNLOAD_DIR / OUTPUT_TEMPLATE),
+        }
+        if format_id:
+            options['format'] = format_id
+        if progress_hook:
+            options['progress_hooks'] = [progress_hook]
+        return options
+
+    def _download_result(self, info):
+        result = summarize_info(info)
+        downloads = info.get('requested_downloads') or [{}]
+        filepath = downloads[0].get('filepath')
+        result['filepath'] = filepath
+        result['format_id'] = info.get('format_id')
+        if filepath and Path(filepath).exists():
+            result['filesize'] = Path(filepath).stat().st_size
+        return result
+
+    def get_storage_used(self):
+        if not DOWNLOAD_DIR.exists():
+            return 0
+        return sum(
+            path.stat().st_size for path in DOWNLOAD_DIR.rglob('*') if path.is_file()
+        )
 
     def get_downloaded_files(self):
         # Logic to return a list of downloaded files
-        pass
\ No newline at end of file
+        pass
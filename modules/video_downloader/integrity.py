@@ -0,0 +1,138 @@
+"""
+Integrity Verification
+Streaming, parallel hashing of downloaded media files
+"""
+import hashlib
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from modules.video_downloader.downloader import DOWNLOAD_DIR
+
+BUFFER_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+VERIFY_WORKERS = 4
+
+# Leftovers of interrupted yt-dlp downloads
+PARTIAL_SUFFIXES = {".part", ".ytdl", ".temp", ".tmp"}
+
+
+def hash_file(path: Path, buffer_size: int = BUFFER_SIZE,
+              mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """SHA-256 of a file using fixed-size buffers (memory-mapped for large files)"""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        f.seek(0)
+
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, buffer_size):
+                        digest.update(view[offset:offset + buffer_size])
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+
+    return digest.hexdigest()
+
+
+class IntegrityVerifier:
+    """Hash downloaded files and record the results in the media catalog"""
+
+    def __init__(self, database, download_dir: Path = DOWNLOAD_DIR, workers: int = VERIFY_WORKERS):
+        self.database = database
+        self.download_dir = Path(download_dir)
+        self.workers = workers
+
+    def verify(self, force: bool = False) -> Dict[str, Any]:
+        """Verify all media files, re-hashing only files whose size or mtime changed"""
+        catalog = {
+            item["path"]: item for item in self.database.get_media_files(limit=-1)
+            if item["path"]
+        }
+
+        files = []
+        incomplete = []
+        if self.download_dir.exists():
+            for path in self.download_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                if path.suffix.lower() in PARTIAL_SUFFIXES:
+                    incomplete.append(str(path))
+                else:
+                    files.append(path)
+
+        to_hash = []
+        skipped = 0
+        for path in files:
+            stat = path.stat()
+            entry = catalog.get(str(path))
+            unchanged = (
+                entry is not None
+                and entry["sha256"]
+                and entry["filesize"] == stat.st_size
+                and entry["file_mtime_ns"] == stat.st_mtime_ns
+            )
+            if unchanged and not force:
+                skipped += 1
+            else:
+                to_hash.append((path, stat, entry))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self._hash_one, to_hash))
+
+        on_disk = {str(path) for path in files}
+        missing = [
+            {"id": item["id"], "path": path, "integrity": "missing"}
+            for path, item in catalog.items()
+            if path not in on_disk and item["integrity"] != "missing"
+        ]
+
+        self.database.record_hashes(results + missing)
+
+        return {
+            "hashed": sum(1 for r in results if r["integrity"] != "error"),
+            "skipped": skipped,
+            "changed": [r["path"] for r in results if r["integrity"] == "changed"],
+            "errors": [r["path"] for r in results if r["integrity"] == "error"],
+            "missing": [m["path"] for m in missing],
+            "incomplete": incomplete
+        }
+
+    def _hash_one(self, item) -> Dict[str, Any]:
+        """Hash a single file and classify the result"""
+        path, stat, entry = item
+        result = {
+            "id": entry["id"] if entry else None,
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": None
+        }
+
+        try:
+            result["sha256"] = hash_file(path)
+        except OSError as e:
+            print(f"Failed to hash {path}: {e}")
+            # Leave size/mtime unset so the next run retries this file
+            result.update(size=None, mtime_ns=None, integrity="error")
+            return result
+
+        previous: Optional[str] = entry["sha256"] if entry else None
+        if previous and previous != result["sha256"]:
+            result["integrity"] = "changed"
+        else:
+            result["integrity"] = "ok"
+
+        return result
@@ -0,0 +1,193 @@
+"""
+Download Planner
+Pick a format that fits the tier's storage and download quotas before downloading
+"""
+from typing import List, Dict, Optional, Any
+
+from entitlements import get_entitlements, VIDEO_DOWNLOADS, STORAGE_LIMIT
+
+MB = 1024 * 1024
+
+
+def estimate_size(fmt: Dict[str, Any], duration: Optional[float]) -> Optional[int]:
+    """Estimate a format's size in bytes from cached metadata"""
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    if size:
+        return int(size)
+
+    # Fall back to total bitrate (kbit/s) x duration
+    if fmt.get("tbr") and duration:
+        return int(fmt["tbr"] * 1000 / 8 * duration)
+
+    return None
+
+
+# yt-dlp marks a missing stream with the literal "none"; an unset codec only
+# means the extractor didn't say (generic direct files, many site extractors)
+def _has_video(fmt: Dict[str, Any]) -> bool:
+    return fmt.get("vcodec") != "none"
+
+
+def _has_audio(fmt: Dict[str, Any]) -> bool:
+    return fmt.get("acodec") != "none"
+
+
+class DownloadPlanner:
+    """Plan downloads against tier quotas and the remaining storage budget"""
+
+    def __init__(self, config, license_tier: str, downloader, database):
+        self.config = config
+        self.license_tier = license_tier
+        self.entitlements = get_entitlements(config, license_tier)
+        self.downloader = downloader
+        self.database = database
+
+    def check_quota(self) -> Dict[str, Any]:
+        """Check the monthly download quota and storage budget"""
+        downloads_remaining = self.entitlements.remaining(VIDEO_DOWNLOADS)
+
+        storage_limit_mb = self.entitlements.limit(STORAGE_LIMIT)
+        storage_remaining = None
+        if storage_limit_mb is not None:
+            storage_remaining = max(storage_limit_mb * MB - self.downloader.get_storage_used(), 0)
+
+        return {
+            "downloads_remaining": downloads_remaining,
+            "storage_remaining": storage_remaining
+        }
+
+    def plan(self, url: str, audio_only: bool = False, max_height: Optional[int] = None,
+             max_bitrate_kbps: Optional[float] = None,
+             format_id: Optional[str] = None) -> Dict[str, Any]:
+        """Choose the best format for a URL, or reject the job up front"""
+        quota = self.check_quota()
+
+        if quota["downloads_remaining"] == 0:
+            return self._reject(
+                f"Monthly download limit reached for {self.license_tier} tier", quota
+            )
+
+        if quota["storage_remaining"] == 0:
+            return self._reject("Storage limit reached", quota)
+
+        try:
+            info = self.downloader.get_video_info(url)
+        except Exception as e:
+            return self._reject(f"Could not read video info: {e}", quota)
+
+        candidates = self.list_formats(info, audio_only, max_height, max_bitrate_kbps)
+        if format_id:
+            candidates = [c for c in candidates if c["format_id"] == format_id]
+        if not candidates:
+            return self._reject("No format matches the selected resolution/bitrate", quota)
+
+        storage_remaining = quota["storage_remaining"]
+        for candidate in candidates:
+            size = candidate["estimated_bytes"]
+            if storage_remaining is None or (size is not None and size <= storage_remaining):
+                return {
+                    "allowed": True,
+                    "reason": None,
+                    "format_id": candidate["format_id"],
+                    "height": candidate["height"],
+                    "estimated_bytes": size,
+                    "title": info.get("title"),
+                    **quota
+                }
+
+        smallest = min(
+            (c["estimated_bytes"] for c in candidates if c["estimated_bytes"] is not None),
+            default=None
+        )
+        if smallest is None:
+            return self._reject("File size unknown; cannot verify storage budget", quota)
+
+        return self._reject(
+            f"Not enough storage: needs {smallest / MB:.1f} MB, "
+            f"{storage_remaining / MB:.1f} MB left",
+            quota
+        )
+
+    def list_formats(self, info: Dict[str, Any], audio_only: bool = False,
+                     max_height: Optional[int] = None,
+                     max_bitrate_kbps: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Build format candidates ordered best-first"""
+        duration = info.get("duration")
+        formats = info.get("formats") or []
+        if not formats:
+            # Single-format result: the info itself describes the only stream
+            # (format_id None lets the downloader pick it)
+            formats = [{
+                "format_id": None,
+                "height": info.get("height"),
+                "tbr": info.get("tbr"),
+                "vcodec": info.get("vcodec"),
+                "acodec": info.get("acodec"),
+                "filesize": info.get("filesize")
+            }]
+
+        audio = [f for f in formats if _has_audio(f) and not _has_video(f)]
+        audio.sort(key=lambda f: f.get("abr") or f.get("tbr") or 0, reverse=True)
+        if audio_only and not audio:
+            # No separate audio stream: the downloader extracts the audio
+            # track from a muxed format (FFmpegExtractAudio)
+            audio = [f for f in formats if _has_audio(f)]
+
+        candidates = []
+
+        if audio_only:
+            for fmt in audio:
+                candidates.append(self._candidate(fmt["format_id"], None,
+                                                  fmt.get("abr") or fmt.get("tbr"),
+                                                  estimate_size(fmt, duration)))
+        else:
+            best_audio = audio[0] if audio else None
+            best_audio_size = estimate_size(best_audio, duration) if best_audio else None
+
+            for fmt in formats:
+                if not _has_video(fmt):
+                    continue
+
+                if _has_audio(fmt):
+                    candidates.append(self._candidate(fmt["format_id"], fmt.get("height"),
+                                                      fmt.get("tbr"), estimate_size(fmt, duration)))
+                elif best_audio:
+                    # Video-only stream merged with the best audio stream
+                    video_size = estimate_size(fmt, duration)
+                    size = None
+                    if video_size is not None and best_audio_size is not None:
+                        size = video_size + best_audio_size
+                    bitrate = (fmt.get("tbr") or 0) + (best_audio.get("abr") or best_audio.get("tbr") or 0)
+                    candidates.append(self._candidate(
+                        f"{fmt['format_id']}+{best_audio['format_id']}",
+                        fmt.get("height"), bitrate or None, size
+                    ))
+
+        if max_height:
+            candidates = [c for c in candidates if (c["height"] or 0) <= max_height]
+
+        if max_bitrate_kbps:
+            candidates = [c for c in candidates if c["bitrate"] and c["bitrate"] <= max_bitrate_kbps]
+
+        candidates.sort(key=lambda c: (c["height"] or 0, c["bitrate"] or 0), reverse=True)
+        return candidates
+
+    def _candidate(self, format_id: str, height: Optional[int], bitrate: Optional[float],
+                   size: Optional[int]) -> Dict[str, Any]:
+        return {
+            "format_id": format_id,
+            "height": height,
+            "bitrate": bitrate,
+            "estimated_bytes": size
+        }
+
+    def _reject(self, reason: str, quota: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "allowed": False,
+            "reason": reason,
+            "format_id": None,
+            "height": None,
+            "estimated_bytes": None,
+            "title": None,
+            **quota
+        }
@@ -0,0 +1,134 @@
+"""
+Video Downloader Service
+Shared, session-independent half of the plugin
+"""
+import logging
+import threading
+from typing import Dict, Optional, Any
+
+from modules.video_downloader.downloader import VideoDownloader
+from modules.video_downloader.database import DownloadsDatabase
+from modules.video_downloader.thumbnails import ThumbnailCache
+from entitlements import get_usage_ledger, VIDEO_DOWNLOADS
+
+logger = logging.getLogger(__name__)
+
+
+class VideoDownloaderService:
+    """Downloader, queue/catalog database and thumbnail cache shared by all sessions"""
+
+    def __init__(self):
+        self.downloader = VideoDownloader()
+        self.db = DownloadsDatabase()
+        self.thumbnails = ThumbnailCache()
+        self._queue_lock = threading.Lock()
+        self._queue_thread: Optional[threading.Thread] = None
+        self._queue_progress: Dict[str, Any] = {"running": False}
+
+    def download(self, url: str, audio_only: bool, format_id: Optional[str],
+                 progress_hook=None) -> Dict[str, Any]:
+        """Download with a planned format and record it in the media catalog
+
+        Download errors propagate so callers can show or store the reason.
+        """
+        if audio_only:
+            result = self.downloader.download_audio_only(url, format_id, progress_hook)
+        else:
+            result = self.downloader.download_video(url, format_id, progress_hook)
+        
+        # Metered against the tier's monthly download limit
+        get_usage_ledger().record(VIDEO_DOWNLOADS, 1, detail=url)
+
+        media_id = self.db.record_download(
+            url,
+            title=result.get("title"),
+            path=result.get("filepath"),
+            format_id=result.get("format_id"),
+            filesize=result.get("filesize")
+        )
+
+        if result.get("thumbnail"):
+            try:
+                thumbnail_hash = self.thumbnails.store_from_url(result["thumbnail"])
+                if thumbnail_hash:
+                    self.db.set_media_thumbnail(media_id, thumbnail_hash)
+            except Exception as e:
+                logger.warning("Thumbnail fetch failed for %s: %s", url, e)
+
+        return result
+
+    def start_queue(self, planner, max_height=None, max_bitrate=None) -> bool:
+        """Process pending jobs in a background thread; False if already running"""
+        with self._queue_lock:
+            if self._queue_thread and self._queue_thread.is_alive():
+                return False
+
+            self._queue_progress = {"running": True, "done": 0, "total": 0, "current": None}
+            self._queue_thread = threading.Thread(
+                target=self._run_queue,
+                args=(planner, max_height, max_bitrate),
+                name="download-queue",
+                daemon=True
+            )
+            self._queue_thread.start()
+            return True
+
+    def queue_status(self) -> Dict[str, Any]:
+        """Snapshot of queue progress"""
+        with self._queue_lock:
+            status = dict(self._queue_progress)
+            if status.get("current"):
+                status["current"] = dict(status["current"])
+            return status
+
+    def _run_queue(self, planner, max_height, max_bitrate):
+        try:
+            jobs = self.db.get_jobs(status="pending", limit=-1)
+            with self._queue_lock:
+                self._queue_progress["total"] = len(jobs)
+
+            for job in jobs:
+                audio_only = job["mode"] == "audio"
+                with self._queue_lock:
+                    self._queue_progress["current"] = {
+                        "title": job["title"] or job["url"],
+                        "downloaded": 0,
+                        "total": job["filesize"]
+                    }
+
+                plan = planner.plan(job["url"], audio_only, max_height, max_bitrate)
+
+                if not plan["allowed"]:
+                    self.db.update_job_status(job["id"], "rejected", plan["reason"])
+                else:
+                    self.db.update_job_status(job["id"], "running")
+                    try:
+                        self.download(job["url"], audio_only, plan["format_id"], self._progress_hook)
+                        self.db.update_job_status(job["id"], "completed")
+                    except Exception as e:
+                        logger.warning("Download failed for %s: %s", job["url"], e)
+                        self.db.update_job_status(job["id"], "failed", str(e))
+
+                with self._queue_lock:
+                    self._queue_progress["done"] += 1
+        finally:
+            with self._queue_lock:
+                self._queue_progress["running"] = False
+                self._queue_progress["current"] = None
+
+    def _progress_hook(self, status: Dict[str, Any]):
+        """yt-dlp progress hook: track bytes of the current job"""
+        if status.get("status") != "downloading":
+            return
+
+        with self._queue_lock:
+            current = self._queue_progress.get("current")
+            if current is not None:
+                current["downloaded"] = status.get("downloaded_bytes") or 0
+                current["total"] = (
+                    status.get("total_bytes") or status.get("total_bytes_estimate") or current["total"]
+                )
+
+    def cleanup(self):
+        """Release resources"""
+        pass
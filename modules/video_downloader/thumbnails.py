@@ -0,0 +1,175 @@
+"""
+Thumbnail Cache
+Content-addressed local thumbnails with LRU eviction, served as static files
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ui.static import STATIC_DIR, static_url
+
+THUMBNAIL_SUBDIR = "thumbnails"
+DEFAULT_BUDGET_MB = 64
+FETCH_TIMEOUT = 10.0
+MAX_THUMBNAIL_BYTES = 2 * 1024 * 1024
+
+CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+
+class ThumbnailCache:
+    """Store thumbnails on disk keyed by the SHA-256 of their bytes"""
+
+    def __init__(self, cache_dir: Path = None, budget_mb: int = DEFAULT_BUDGET_MB,
+                 index_path: str = "~/.aigem2/cache/thumbnails.db"):
+        self.cache_dir = Path(cache_dir) if cache_dir else STATIC_DIR / THUMBNAIL_SUBDIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.index_path = Path(index_path).expanduser()
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_index()
+
+    def _init_index(self):
+        """Initialize index schema"""
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                hash TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_thumbnails_last_access
+            ON thumbnails (last_access)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def store_from_url(self, url: str) -> Optional[str]:
+        """Fetch a remote thumbnail and store it, returning its content hash"""
+        request = urllib.request.Request(url, headers={"User-Agent": "AIGEM2"})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            content_type = response.headers.get_content_type()
+            data = response.read(MAX_THUMBNAIL_BYTES + 1)
+
+        if len(data) > MAX_THUMBNAIL_BYTES:
+            return None
+
+        extension = CONTENT_TYPES.get(content_type)
+        if extension is None:
+            extension = Path(url.split("?")[0]).suffix.lstrip(".").lower() or "jpg"
+
+        return self.store_bytes(data, extension)
+
+    def store_bytes(self, data: bytes, extension: str = "jpg") -> str:
+        """Store thumbnail bytes, returning their content hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{digest}.{extension}"
+        path = self.cache_dir / filename
+
+        # Identical content is stored once; write atomically so readers never see partial files
+        if not path.exists():
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO thumbnails (hash, filename, size, last_access)
+            VALUES (?, ?, ?, ?)
+        """, (digest, filename, len(data), time.time()))
+        conn.commit()
+        conn.close()
+
+        self._evict(keep=digest)
+        return digest
+
+    def get_urls(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Map content hashes to static URLs, marking them as recently used"""
+        hashes = [h for h in set(hashes) if h]
+        if not hashes:
+            return {}
+
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+
+        urls = {}
+        now = time.time()
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(
+                f"SELECT hash, filename FROM thumbnails WHERE hash IN ({placeholders})",
+                chunk
+            )
+            for digest, filename in cursor.fetchall():
+                urls[digest] = static_url(f"{THUMBNAIL_SUBDIR}/{filename}")
+
+            # One batched LRU touch per render instead of one write per item
+            cursor.execute(
+                f"UPDATE thumbnails SET last_access = ? WHERE hash IN ({placeholders})",
+                [now] + chunk
+            )
+
+        conn.commit()
+        conn.close()
+        return urls
+
+    def get_total_size(self) -> int:
+        """Total bytes stored in the cache"""
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails")
+        total = cursor.fetchone()[0]
+        conn.close()
+        return total
+
+    def _evict(self, keep: Optional[str] = None) -> List[str]:
+        """Delete least recently used thumbnails until the cache fits the budget"""
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails")
+        total = cursor.fetchone()[0]
+        if total <= self.budget_bytes:
+            conn.close()
+            return []
+
+        evicted = []
+        cursor.execute("SELECT hash, filename, size FROM thumbnails ORDER BY last_access")
+        for digest, filename, size in cursor.fetchall():
+            if total <= self.budget_bytes:
+                break
+            if digest == keep:
+                continue
+
+            (self.cache_dir / filename).unlink(missing_ok=True)
+            evicted.append(digest)
+            total -= size
+
+        cursor.executemany("DELETE FROM thumbnails WHERE hash = ?", [(h,) for h in evicted])
+        conn.commit()
+        conn.close()
+
+        return evicted
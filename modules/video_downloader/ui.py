@@ -2,56 +2,363 @@
 Video Downloader UI
 Streamlit interface for downloading videos
 """
+import html
+import uuid
+
 import streamlit as st
-from modules.video_downloader.downloader import VideoDownloader
+from modules.video_downloader.service import VideoDownloaderService
+from modules.video_downloader.batch import BatchIngestor, parse_batch_input, normalize_url
+from modules.video_downloader.planner import DownloadPlanner, MB
+from modules.video_downloader.integrity import IntegrityVerifier
 from i18n.loader import get_text
+from ui.components.fragment import fragment
+from ui.perf import measure_interaction, measure_payload, trace_rerun
+
+RESOLUTION_OPTIONS = [None, 2160, 1440, 1080, 720, 480, 360]
 
 
 class VideoDownloaderUI:
     """Video Downloader user interface"""
     
-    def __init__(self, config, license_tier: str):
+    def __init__(self, config, license_tier: str, service: VideoDownloaderService = None):
         self.config = config
         self.license_tier = license_tier
-        self.downloader = VideoDownloader()
+        service = service or VideoDownloaderService()
+        self.service = service
+        self.downloader = service.downloader
+        self.db = service.db
+        self.thumbnails = service.thumbnails
+        self.planner = DownloadPlanner(config, license_tier, self.downloader, self.db)
     
     def render_ui(self):
         """Render main UI"""
         st.title("🎥 " + get_text("video_downloader"))
         
-        if self.license_tier == "FREE":
+        if not self.planner.entitlements.has("video_download"):
             st.warning("This feature requires STARTER tier or higher")
             if st.button("⬆️ Upgrade Now"):
                 st.session_state.current_page = "tier_management"
                 st.rerun()
             return
         
+        single_tab, batch_tab, library_tab = st.tabs(["Single URL", "Batch", "Library"])
+        
+        with single_tab:
+            self._render_single()
+        
+        with batch_tab:
+            self._render_batch()
+        
+        with library_tab:
+            self._render_library()
+    
+    def _render_single(self):
+        """Render single URL download"""
         video_url = st.text_input(
             get_text("paste_url"),
-            placeholder="https://www.youtube.com/watch?v=..."
+            placeholder="https://www.youtube.com/watch?v=...",
+            key="single_video_url",
+            on_change=self._prefetch_single_url
         )
         
+        url, _ = normalize_url(video_url) if video_url else (None, None)
+        
+        max_height, max_bitrate = self._render_format_limits("single")
+        
+        format_id = None
+        if url:
+            self._start_prefetch(url)
+            format_id = self._render_preview(url, max_height, max_bitrate)
+        
         col1, col2 = st.columns(2)
         
         with col1:
             if st.button("⬇️ Download Video", type="primary"):
-                if video_url:
-                    with st.spinner("Downloading..."):
-                        result = self.downloader.download_video(video_url)
-                        if result:
-                            st.success("Download complete!")
-                        else:
-                            st.error("Download failed")
+                if url:
+                    self._download(url, False, max_height, max_bitrate, format_id)
         
         with col2:
             if st.button("🎵 Download Audio Only"):
-                if video_url:
-                    with st.spinner("Downloading audio..."):
-                        result = self.downloader.download_audio_only(video_url)
-                        if result:
-                            st.success("Audio download complete!")
-                        else:
-                            st.error("Download failed")
+                if url:
+                    self._download(url, True, max_height, max_bitrate)
+    
+    def _prefetch_single_url(self):
+        """Start metadata extraction as soon as a valid URL is entered"""
+        url, error = normalize_url(st.session_state.get("single_video_url") or "")
+        if not error:
+            self._start_prefetch(url)
+    
+    def _start_prefetch(self, url: str):
+        """Queue a debounced background info extraction for this session"""
+        if "prefetch_key" not in st.session_state:
+            st.session_state.prefetch_key = uuid.uuid4().hex
+        self.downloader.prefetch_info(url, key=st.session_state.prefetch_key)
+    
+    def _render_preview(self, url: str, max_height=None, max_bitrate=None):
+        """Show title, duration, size and format choices from the info cache"""
+        info = self.downloader.get_cached_info(url)
+        
+        if info is None:
+            error = self.downloader.get_prefetch_error(url)
+            if error:
+                st.warning(f"Couldn't read video info: {error}")
+            elif self.downloader.get_prefetch(url) is not None:
+                # Don't block the rerun; the fragment polls for the result
+                self._render_preview_pending(url)
+            else:
+                st.caption("Video info will load when you start the download")
+            return None
+        
+        with st.container():
+            duration = info.get("duration")
+            minutes, seconds = divmod(int(duration or 0), 60)
+            st.markdown(f"**{info.get('title') or url}**")
+            st.caption(
+                f"{info.get('uploader') or info.get('extractor') or ''}"
+                + (f" · {minutes}:{seconds:02d}" if duration else "")
+            )
+            
+            formats = self.planner.list_formats(info, False, max_height, max_bitrate)
+            if not formats:
+                return None
+            
+            choice = st.selectbox(
+                "Format",
+                options=formats,
+                format_func=self._format_label,
+                key=f"format_{url}"
+            )
+            return choice["format_id"]
+    
+    @fragment(run_every=0.5)
+    def _render_preview_pending(self, url: str):
+        """Placeholder that reruns the page once the prefetched info is cached"""
+        if self.downloader.get_cached_info(url) is not None:
+            st.rerun()
+        
+        # A failed or superseded prefetch must not trigger a full rerun: that
+        # would submit the URL again and loop
+        error = self.downloader.get_prefetch_error(url)
+        if error:
+            st.warning(f"Couldn't read video info: {error}")
+        elif self.downloader.get_prefetch(url) is None:
+            st.caption("Video info will load when you start the download")
+        else:
+            st.caption("🔎 Fetching video info...")
+    
+    def _format_label(self, candidate) -> str:
+        """Human-readable format option"""
+        height = f"{candidate['height']}p" if candidate["height"] else "audio"
+        size = (
+            f"{candidate['estimated_bytes'] / MB:.1f} MB"
+            if candidate["estimated_bytes"] else "size unknown"
+        )
+        return f"{height} · {size} · {candidate['format_id'] or 'default'}"
+    
+    def _render_format_limits(self, key: str):
+        """Render max resolution / bitrate selectors"""
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            max_height = st.selectbox(
+                "Max resolution",
+                options=RESOLUTION_OPTIONS,
+                format_func=lambda h: "Best available" if h is None else f"{h}p",
+                key=f"max_height_{key}"
+            )
+        
+        with col2:
+            max_bitrate = st.number_input(
+                "Max bitrate (kbps, 0 = no limit)",
+                min_value=0,
+                value=0,
+                step=500,
+                key=f"max_bitrate_{key}"
+            )
+        
+        return max_height, max_bitrate or None
+    
+    def _download(self, url: str, audio_only: bool, max_height=None, max_bitrate=None,
+                  format_id=None):
+        """Plan and run a single download"""
+        with st.spinner("Checking formats and quota..."):
+            plan = self.planner.plan(url, audio_only, max_height, max_bitrate, format_id)
+        
+        if not plan["allowed"]:
+            st.error(plan["reason"])
+            return
+        
+        if plan["estimated_bytes"]:
+            st.caption(f"Format {plan['format_id'] or 'default'} · ~{plan['estimated_bytes'] / MB:.1f} MB")
+        
+        try:
+            with st.spinner("Downloading audio..." if audio_only else "Downloading..."):
+                self.service.download(url, audio_only, plan["format_id"])
+        except Exception as e:
+            st.error(f"Download failed: {e}")
+            return
+        
+        st.success("Audio download complete!" if audio_only else "Download complete!")
+    
+    def _render_library(self):
+        """Render downloaded media as a thumbnail grid"""
+        if st.button("🔍 Verify Files"):
+            with st.spinner("Hashing media files..."):
+                report = IntegrityVerifier(self.db).verify()
+            self._render_integrity_report(report)
+        
+        media = self.db.get_media_files()
+        
+        if not media:
+            st.info("No downloads yet")
+            return
+        
+        urls = self.thumbnails.get_urls(item["thumbnail_hash"] for item in media)
+        
+        # One HTML block for the whole grid; images load from local static files
+        cards = []
+        for item in media:
+            title = html.escape(item["title"] or item["url"])
+            src = urls.get(item["thumbnail_hash"])
+            image = (
+                f"<img src='{src}' loading='lazy' style='width:100%; aspect-ratio:16/9; object-fit:cover; border-radius:6px;'>"
+                if src else
+                "<div style='width:100%; aspect-ratio:16/9; background:#334155; border-radius:6px;'></div>"
+            )
+            cards.append(
+                f"<div>{image}<div style='font-size:12px; margin-top:4px; overflow:hidden; "
+                f"text-overflow:ellipsis; white-space:nowrap;' title='{title}'>{title}</div></div>"
+            )
+        
+        st.markdown(
+            "<div style='display:grid; grid-template-columns:repeat(auto-fill, minmax(180px, 1fr)); gap:12px;'>"
+            + "".join(cards) + "</div>",
+            unsafe_allow_html=True
+        )
+    
+    def _render_batch(self):
+        """Render batch URL ingestion"""
+        pasted = st.text_area(
+            "URLs (one per line)",
+            height=200,
+            placeholder="https://www.youtube.com/watch?v=...\nhttps://youtu.be/..."
+        )
+        
+        uploaded = st.file_uploader("Or upload a text/CSV file", type=["txt", "csv"])
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            audio_only = st.checkbox("Audio only")
+        
+        with col2:
+            resolve_metadata = st.checkbox("Fetch metadata now", value=True)
+        
+        if st.button("📥 Add to Queue", type="primary"):
+            text = pasted or ""
+            if uploaded is not None:
+                text += "\n" + uploaded.getvalue().decode("utf-8", errors="replace")
+            
+            entries = parse_batch_input(text)
+            if not entries:
+                st.error("No URLs found")
+            else:
+                with st.spinner(f"Processing {len(entries)} URL(s)..."):
+                    ingestor = BatchIngestor(self.downloader, self.db)
+                    summary = ingestor.ingest(
+                        entries,
+                        resolve_metadata=resolve_metadata,
+                        mode="audio" if audio_only else "video"
+                    )
+                self._render_batch_summary(summary)
+        
+        st.divider()
+        self._render_queue()
+    
+    def _render_batch_summary(self, summary):
+        """Render accepted/duplicate/invalid counts"""
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Accepted", len(summary["accepted"]))
+        
+        with col2:
+            st.metric("Duplicates", len(summary["duplicates"]))
+        
+        with col3:
+            st.metric("Invalid", len(summary["invalid"]))
+        
+        if summary["duplicates"]:
+            with st.expander("Duplicate URLs"):
+                st.code("\n".join(summary["duplicates"]))
+        
+        if summary["invalid"]:
+            with st.expander("Invalid entries"):
+                for item in summary["invalid"]:
+                    st.markdown(f"- `{item['entry']}` — {item['reason']}")
+    
+    def _render_queue(self):
+        """Render download queue"""
+        st.markdown("### Queue")
+        
+        if self.service.queue_status()["running"]:
+            self._render_queue_progress()
+            return
+        
+        counts = self.db.get_job_counts()
+        pending = counts.get("pending", 0)
+        
+        st.caption(
+            f"Pending: {pending} · Completed: {counts.get('completed', 0)} · "
+            f"Failed: {counts.get('failed', 0)} · Rejected: {counts.get('rejected', 0)}"
+        )
+        
+        if pending:
+            max_height, max_bitrate = self._render_format_limits("queue")
+            
+            if st.button("▶️ Start Queued Downloads"):
+                self.service.start_queue(self.planner, max_height, max_bitrate)
+                st.rerun()
+    
+    @fragment(run_every=1.0)
+    def _render_queue_progress(self):
+        """Live progress; polls by rerunning only this fragment"""
+        with measure_interaction("fragment:download_progress"), measure_payload("fragment:download_progress"), trace_rerun("fragment:download_progress"):
+            status = self.service.queue_status()
+            
+            if not status["running"]:
+                # Finished: one full rerun swaps back to the queue controls
+                st.rerun()
+            
+            total = status["total"] or 1
+            st.progress(status["done"] / total, text=f"{status['done']} / {status['total']} jobs")
+            
+            current = status.get("current")
+            if current:
+                fraction = 0.0
+                if current["total"]:
+                    fraction = min(current["downloaded"] / current["total"], 1.0)
+                st.progress(fraction, text=current["title"])
+    
+    def _render_integrity_report(self, report):
+        """Render verification summary"""
+        st.caption(f"Hashed: {report['hashed']} · Unchanged (skipped): {report['skipped']}")
+        
+        problems = {
+            "Changed since last verification": report["changed"],
+            "Incomplete downloads": report["incomplete"],
+            "Missing from disk": report["missing"],
+            "Unreadable": report["errors"],
+        }
+        
+        if not any(problems.values()):
+            st.success("All files verified")
+            return
+        
+        for label, paths in problems.items():
+            if paths:
+                with st.expander(f"{label} ({len(paths)})"):
+                    st.code("\n".join(paths))
     
     def cleanup(self):
         pass
@@ -0,0 +1,109 @@
+"""
+Plugin Warm-up
+Import reachable plugins in the background, most-visited first
+"""
+import atexit
+import importlib
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Visits are written at most this often (and at exit), never on the render path
+FLUSH_DELAY = 5.0
+
+
+class NavigationStats:
+    """Persistent per-plugin visit counts"""
+
+    def __init__(self, path: str = "~/.aigem2/cache/plugin_usage.json"):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._counts: Optional[Dict[str, int]] = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict[str, int]:
+        if self._counts is None:
+            try:
+                self._counts = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._counts = {}
+        return self._counts
+
+    def record(self, plugin_id: str):
+        """Count one visit to a plugin page (saved by a debounced flush)"""
+        with self._lock:
+            counts = self._load()
+            counts[plugin_id] = counts.get(plugin_id, 0) + 1
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending counts to disk"""
+        with self._lock:
+            self._timer = None
+            if not self._dirty:
+                return
+            data = json.dumps(self._counts)
+            self._dirty = False
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(data)
+        except OSError as e:
+            print(f"Failed to save navigation stats: {e}")
+
+    def rank(self, plugin_ids: List[str]) -> List[str]:
+        """Order plugin ids by visit count, most visited first"""
+        with self._lock:
+            counts = dict(self._load())
+        return sorted(plugin_ids, key=lambda plugin_id: counts.get(plugin_id, 0), reverse=True)
+
+
+class PluginWarmer:
+    """Single background thread that pre-imports plugin modules"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._requested: List[str] = []
+        self._warmed = set()
+
+    def warm(self, module_paths: List[str]):
+        """Queue modules for import; starts the worker if it is idle"""
+        with self._lock:
+            for module_path in module_paths:
+                if module_path not in self._warmed and module_path not in self._requested:
+                    self._requested.append(module_path)
+
+            if not self._requested or (self._thread and self._thread.is_alive()):
+                return
+
+            self._thread = threading.Thread(target=self._run, name="plugin-warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._requested:
+                    return
+                module_path = self._requested.pop(0)
+
+            if module_path not in sys.modules:
+                try:
+                    importlib.import_module(module_path)
+                except Exception as e:
+                    print(f"Warm-up import failed for {module_path}: {e}")
+
+            with self._lock:
+                self._warmed.add(module_path)
+
+
+navigation_stats = NavigationStats()
+plugin_warmer = PluginWarmer()
@@ -0,0 +1,318 @@
+"""
+AIGEM2 Outbox
+Durable SQLite queue for server-bound requests, drained by a background sender
+"""
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Dict, Optional, Any
+
+from licensing.crypto.obfuscation import seal, unseal
+
+BASE_DELAY = 5.0
+MAX_DELAY = 3600.0
+POLL_INTERVAL = 60.0
+BATCH_SIZE = 20
+
+# Delivery callbacks per kind: callback(payload, response)
+_handlers: Dict[str, List[Callable[[Dict[str, Any], Any], None]]] = {}
+_handlers_lock = threading.Lock()
+
+# Kinds safe to resend after a timeout; everything else is sent once per attempt
+_idempotent_kinds = set()
+# Kinds whose rejected items are deleted instead of kept as 'failed' (secrets)
+_discard_failed_kinds = set()
+
+
+def subscribe(kind: str, callback: Callable[[Dict[str, Any], Any], None]):
+    """Call back when an item of this kind is answered by the server (2xx or 4xx)"""
+    with _handlers_lock:
+        _handlers.setdefault(kind, []).append(callback)
+
+
+def configure(kind: str, idempotent: bool = False, keep_failed: bool = True):
+    """Declare whether the API client may retry this kind after a timeout,
+    and whether rejected items stay in the table for inspection"""
+    with _handlers_lock:
+        for kinds, enabled in ((_idempotent_kinds, idempotent), (_discard_failed_kinds, not keep_failed)):
+            if enabled:
+                kinds.add(kind)
+            else:
+                kinds.discard(kind)
+
+
+def idempotency_key(item: Dict[str, Any]) -> str:
+    """Same key for every attempt of a row; a coalesced replacement gets a new one"""
+    digest = hashlib.sha256((item["payload"] or "").encode()).hexdigest()[:16]
+    return f"outbox-{item['id']}-{digest}"
+
+
+class Outbox:
+    """Requests that must reach the server eventually"""
+
+    def __init__(self, db_path: str = "~/.aigem2/outbox.db"):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload TEXT,
+                coalesce_key TEXT UNIQUE,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                last_error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)")
+
+        # Items claimed by a sender that died mid-request go back to the queue
+        cursor.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+
+        # Payloads used to be stored as plain JSON; seal them and overwrite
+        # the freed pages so license keys don't linger in the file
+        cursor.execute("SELECT id, payload FROM outbox WHERE payload LIKE '{%'")
+        legacy = cursor.fetchall()
+        if legacy:
+            cursor.execute("PRAGMA secure_delete = ON")
+            cursor.executemany(
+                "UPDATE outbox SET payload = ? WHERE id = ?",
+                [(seal(payload), item_id) for item_id, payload in legacy]
+            )
+
+        conn.commit()
+        conn.close()
+
+    def enqueue(self, kind: str, method: str, url: str, payload: Optional[Dict[str, Any]] = None,
+                coalesce_key: Optional[str] = None) -> int:
+        """Queue a request; an item with the same coalesce_key is replaced"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        # Sealed with the machine key, like the activation key file
+        payload_json = seal(json.dumps(payload)) if payload is not None else None
+
+        if coalesce_key:
+            # Only the latest matters (e.g. heartbeats): overwrite and retry now
+            cursor.execute("""
+                INSERT INTO outbox (kind, method, url, payload, coalesce_key, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(coalesce_key) DO UPDATE SET
+                    kind = excluded.kind,
+                    method = excluded.method,
+                    url = excluded.url,
+                    payload = excluded.payload,
+                    status = 'pending',
+                    attempts = 0,
+                    next_attempt_at = excluded.next_attempt_at,
+                    last_error = NULL
+            """, (kind, method, url, payload_json, coalesce_key, time.time()))
+            cursor.execute("SELECT id FROM outbox WHERE coalesce_key = ?", (coalesce_key,))
+            item_id = cursor.fetchone()[0]
+        else:
+            cursor.execute("""
+                INSERT INTO outbox (kind, method, url, payload, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (kind, method, url, payload_json, time.time()))
+            item_id = cursor.lastrowid
+
+        conn.commit()
+        conn.close()
+
+        self._wake.set()
+        return item_id
+
+    def get_items(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Queued items, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        if status:
+            cursor.execute("SELECT * FROM outbox WHERE status = ? ORDER BY id", (status,))
+        else:
+            cursor.execute("SELECT * FROM outbox ORDER BY id")
+
+        items = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        return items
+
+    def start(self):
+        """Start the sender thread (idempotent)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Drain now instead of waiting for the next poll (e.g. back online)"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except sqlite3.Error as e:
+                print(f"Outbox drain failed: {e}")
+
+            self._wake.wait(self._seconds_until_due())
+            self._wake.clear()
+
+    def _seconds_until_due(self) -> float:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'")
+        next_due = cursor.fetchone()[0]
+        conn.close()
+
+        if next_due is None:
+            return POLL_INTERVAL
+        return min(max(next_due - time.time(), 0.0), POLL_INTERVAL)
+
+    def drain(self) -> int:
+        """Send every due item once; returns the number delivered"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA secure_delete = ON")
+
+        with _handlers_lock:
+            discard_kinds = list(_discard_failed_kinds)
+        if discard_kinds:
+            # Rejected before this policy existed (or by another process)
+            cursor.execute(
+                f"DELETE FROM outbox WHERE status = 'failed' AND kind IN ({', '.join('?' * len(discard_kinds))})",
+                discard_kinds
+            )
+            conn.commit()
+
+        cursor.execute("""
+            SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY id LIMIT ?
+        """, (time.time(), BATCH_SIZE))
+        items = [dict(row) for row in cursor.fetchall()]
+
+        delivered = 0
+        for item in items:
+            # Claim the row so a concurrent drain (another app process) skips it
+            cursor.execute("UPDATE outbox SET status = 'sending' WHERE id = ? AND status = 'pending'", (item["id"],))
+            conn.commit()
+            if cursor.rowcount == 0:
+                continue
+
+            if self._send(cursor, item):
+                delivered += 1
+            conn.commit()
+
+        conn.close()
+        return delivered
+
+    def _send(self, cursor, item: Dict[str, Any]) -> bool:
+        """Deliver one claimed item and update its row"""
+        from api_client import get_api_client
+
+        payload = None
+        if item["payload"]:
+            sealed = unseal(item["payload"])
+            if sealed is None:
+                # Sealed under another machine key (hostname/user changed): unsendable
+                print(f"Outbox item {item['id']} ({item['kind']}) can't be decoded; dropping it")
+                cursor.execute("DELETE FROM outbox WHERE id = ? AND status = 'sending'", (item["id"],))
+                return False
+            payload = json.loads(sealed)
+
+        # Later attempts may repeat a request the server already applied (e.g.
+        # a timed-out activation); the key lets the server drop the duplicate
+        try:
+            response = get_api_client().request(
+                item["method"],
+                item["url"],
+                json=payload,
+                headers={"Idempotency-Key": idempotency_key(item)},
+                idempotent=item["kind"] in _idempotent_kinds
+            )
+        except Exception as e:
+            # Offline, timeout or open circuit: try again later
+            self._reschedule(cursor, item, str(e) or type(e).__name__)
+            return False
+
+        if response.status_code == 429 or response.status_code >= 500:
+            self._reschedule(cursor, item, f"HTTP {response.status_code}")
+            return False
+
+        # 2xx, or a 4xx the server will keep rejecting: either way it's answered
+        self._notify(item["kind"], payload, response)
+
+        if response.status_code < 400:
+            # A coalesced replacement arriving mid-send resets status; keep it
+            cursor.execute("DELETE FROM outbox WHERE id = ? AND status = 'sending'", (item["id"],))
+            return True
+
+        with _handlers_lock:
+            discard = item["kind"] in _discard_failed_kinds
+        if discard:
+            cursor.execute("DELETE FROM outbox WHERE id = ? AND status = 'sending'", (item["id"],))
+        else:
+            cursor.execute("""
+                UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ?
+                WHERE id = ? AND status = 'sending'
+            """, (f"HTTP {response.status_code}", item["id"]))
+        return False
+
+    def _reschedule(self, cursor, item: Dict[str, Any], error: str):
+        attempts = item["attempts"] + 1
+        delay = min(MAX_DELAY, BASE_DELAY * 2 ** attempts) * random.uniform(0.5, 1.0)
+        cursor.execute("""
+            UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ?
+            WHERE id = ? AND status = 'sending'
+        """, (attempts, time.time() + delay, error, item["id"]))
+
+    def _notify(self, kind: str, payload: Optional[Dict[str, Any]], response):
+        with _handlers_lock:
+            callbacks = list(_handlers.get(kind, []))
+        for callback in callbacks:
+            try:
+                callback(payload, response)
+            except Exception as e:
+                print(f"Outbox handler for {kind} failed: {e}")
+
+
+_outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> Outbox:
+    """Process-wide outbox with its sender running"""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox()
+                _outbox.start()
+    return _outbox
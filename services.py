@@ -0,0 +1,110 @@
+"""
+AIGEM2 Service Container
+Builds config, license status and the app once per process / per session
+instead of on every Streamlit rerun
+"""
+import threading
+from typing import Optional
+
+import streamlit as st
+
+import outbox
+from config import AppConfig
+from ui.app import MainApp
+from licensing.client.license_validator import check_license_validity, ACTIVATE
+from licensing.client.license_state import get_license_state
+
+SESSION_KEY = "_services"
+
+
+class ServiceContainer:
+    """Process-wide services shared by every session"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config: Optional[AppConfig] = None
+        self._license_status: Optional[str] = None
+        self.license_version = 0
+
+        # Activations queued while offline change the tier when they land
+        outbox.subscribe(ACTIVATE, lambda payload, response: self.invalidate_license())
+        # Drain requests left over from previous runs
+        outbox.get_outbox()
+
+    def config(self) -> AppConfig:
+        """Shared AppConfig (built on first use)"""
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = AppConfig()
+        return self._config
+
+    def license_status(self) -> str:
+        """License tier for this machine (memoized by the license state cache)"""
+        status = check_license_validity()
+        if status != self._license_status:
+            # Key file changed or grace window ran out: sessions rebuild
+            with self._lock:
+                if status != self._license_status:
+                    if self._license_status is not None:
+                        self.license_version += 1
+                    self._license_status = status
+        return status
+
+    @property
+    def config_version(self) -> int:
+        """Changes whenever a new config snapshot is live (background sync or refresh)"""
+        return self.config().version
+
+    def refresh_config(self) -> bool:
+        """Event: re-sync config from the server; sessions rebuild on their next rerun"""
+        return self.config().refresh()
+
+    def invalidate_license(self):
+        """Event: license activated or changed; re-check on next access"""
+        get_license_state().invalidate()
+        with self._lock:
+            self._license_status = None
+            self.license_version += 1
+
+
+class SessionServices:
+    """Per-session objects, rebuilt only when a shared service changes"""
+
+    def __init__(self):
+        self.app = None
+        self.versions = None
+
+    def get_app(self, container: ServiceContainer) -> MainApp:
+        """MainApp for this session"""
+        license_status = container.license_status()
+        versions = (container.config_version, container.license_version)
+
+        if self.app is None or self.versions != versions:
+            if self.app is not None:
+                self.app.plugin_manager.cleanup()
+            self.app = MainApp(container.config(), license_status)
+            self.versions = versions
+
+        return self.app
+
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> ServiceContainer:
+    """Process-wide service container"""
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                _container = ServiceContainer()
+    return _container
+
+
+def get_session_app() -> MainApp:
+    """MainApp for the current Streamlit session"""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = SessionServices()
+    return st.session_state[SESSION_KEY].get_app(get_container())
@@ -0,0 +1,88 @@
+"""
+API client tests
+Circuit breaker transitions and the half-open probe
+"""
+import time
+
+import pytest
+
+from api_client import ApiClient, ApiUnavailableError, CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+COOLDOWN = 0.05
+
+
+def test_breaker_closed_open_half_open_closed():
+    breaker = CircuitBreaker(threshold=2, cooldown=COOLDOWN)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    time.sleep(COOLDOWN)
+    assert breaker.state == HALF_OPEN
+    # One probe at a time
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(threshold=1, cooldown=COOLDOWN)
+    breaker.record_failure()
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+
+
+@pytest.fixture
+def client_with(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+
+    def build(handler):
+        client = ApiClient(max_retries=0)
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client
+
+    return build
+
+
+def test_probe_raising_unexpected_error_does_not_stick(client_with):
+    import httpx
+
+    url = "http://api.test/config"
+    calls = {"fail": True}
+
+    def handler(request):
+        if calls["fail"]:
+            raise httpx.TooManyRedirects("redirect loop", request=request)
+        return httpx.Response(200, json={})
+
+    client = client_with(handler)
+    breaker = client.breaker(url)
+    breaker.threshold, breaker.cooldown = 1, COOLDOWN
+    breaker.record_failure()
+    time.sleep(COOLDOWN)
+    assert breaker.state == HALF_OPEN
+
+    with pytest.raises(httpx.TooManyRedirects):
+        client.get(url)
+
+    # The probe was settled as a failure: open again, not refused forever
+    assert breaker.state == OPEN
+    with pytest.raises(ApiUnavailableError):
+        client.get(url)
+
+    time.sleep(COOLDOWN)
+    calls["fail"] = False
+    assert client.get(url).status_code == 200
+    assert breaker.state == CLOSED
@@ -0,0 +1,156 @@
+"""
+Config stale-while-revalidate tests
+AppConfig against a local stub of the /config/pricing endpoint
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+import api_client
+from config import AppConfig
+
+CONFIG_A = {"tiers": {"FREE": {"video_downloads_monthly": 3}}}
+CONFIG_B = {"tiers": {"FREE": {"video_downloads_monthly": 5}}}
+
+
+class StubServer:
+    """Serves one config with an ETag; can hold responses or fail the first calls"""
+
+    def __init__(self):
+        self.config = CONFIG_A
+        self.etag = '"v1"'
+        self.failures = 0
+        self.status = None
+        self.release = threading.Event()
+        self.release.set()
+        self.requests = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                stub.release.wait(5)
+                if stub.failures:
+                    stub.failures -= 1
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                if stub.status:
+                    self.send_response(stub.status)
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == stub.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub.config).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", stub.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    stub = StubServer()
+    monkeypatch.setattr(AppConfig, "API_BASE_URL", stub.url)
+    monkeypatch.setattr(AppConfig, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(AppConfig, "CONFIG_CACHE_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(AppConfig, "RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(api_client, "_client", api_client.ApiClient())
+    yield stub
+    stub.close()
+
+
+def write_stale_cache(path, config, etag):
+    cached_at = datetime.utcnow() - timedelta(hours=AppConfig.CACHE_VALIDITY_HOURS + 1)
+    path.write_text(json.dumps({
+        "cached_at": cached_at.isoformat(),
+        "etag": etag,
+        "last_modified": None,
+        "config": config
+    }))
+    return cached_at
+
+
+def wait_for_revalidation(config):
+    config._refresh_thread.join(5)
+    assert not config._refresh_thread.is_alive()
+
+
+def test_stale_snapshot_served_immediately_and_304_restarts_validity(server):
+    cached_at = write_stale_cache(AppConfig.CONFIG_CACHE_FILE, CONFIG_A, '"v1"')
+    server.release.clear()
+
+    config = AppConfig()
+
+    # Server hasn't answered yet; the stale snapshot is already in use
+    assert config.get_tier_config("FREE") == {"video_downloads_monthly": 3}
+    assert config.version == 0
+
+    server.release.set()
+    wait_for_revalidation(config)
+
+    assert server.requests[-1].get("If-None-Match") == '"v1"'
+    cache = json.loads(AppConfig.CONFIG_CACHE_FILE.read_text())
+    assert datetime.fromisoformat(cache["cached_at"]) > cached_at
+    assert cache["config"] == CONFIG_A
+    assert config.version == 0
+
+
+def test_200_swaps_snapshot_and_bumps_version(server):
+    write_stale_cache(AppConfig.CONFIG_CACHE_FILE, CONFIG_A, '"v1"')
+    server.config, server.etag = CONFIG_B, '"v2"'
+
+    config = AppConfig()
+    wait_for_revalidation(config)
+
+    assert config.get_tier_config("FREE") == {"video_downloads_monthly": 5}
+    assert config.version == 1
+    cache = json.loads(AppConfig.CONFIG_CACHE_FILE.read_text())
+    assert cache["etag"] == '"v2"'
+    assert cache["config"] == CONFIG_B
+
+
+def test_failed_revalidation_is_retried(server):
+    write_stale_cache(AppConfig.CONFIG_CACHE_FILE, CONFIG_A, '"v1"')
+    server.config, server.etag = CONFIG_B, '"v2"'
+    server.failures = 2
+
+    config = AppConfig()
+    wait_for_revalidation(config)
+
+    assert len(server.requests) == 3
+    assert config.get_tier_config("FREE") == {"video_downloads_monthly": 5}
+    assert config.version == 1
+
+
+def test_rejected_revalidation_is_not_retried(server):
+    write_stale_cache(AppConfig.CONFIG_CACHE_FILE, CONFIG_A, '"v1"')
+    server.status = 404
+
+    config = AppConfig()
+    wait_for_revalidation(config)
+
+    assert len(server.requests) == 1
+    assert config.get_tier_config("FREE") == {"video_downloads_monthly": 3}
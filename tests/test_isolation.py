@@ -0,0 +1,81 @@
+"""
+Process isolation tests
+A toy service run through ProcessServiceProxy: values, errors and streams
+"""
+import gc
+
+import pytest
+
+from modules import isolation
+from modules.isolation import ProcessServiceProxy, PluginWorkerError
+
+# Imported by the spawned worker from the repo root
+TOY_MODULE = "tests.test_isolation"
+
+
+class ToyService:
+    """Stand-in for a plugin service half"""
+
+    def add(self, a, b):
+        return a + b
+
+    def fail(self, message):
+        raise ValueError(message)
+
+    def count(self, n):
+        for i in range(n):
+            yield i
+
+    def pid(self):
+        import os
+        return os.getpid()
+
+
+@pytest.fixture
+def proxy():
+    proxy = ProcessServiceProxy("toy", TOY_MODULE, "ToyService", workers=1)
+    yield proxy
+    proxy.cleanup()
+
+
+def test_value(proxy):
+    assert proxy.add(2, 3) == 5
+
+
+def test_error_keeps_worker(proxy):
+    pid = proxy.pid()
+    with pytest.raises(PluginWorkerError, match="ValueError: boom"):
+        proxy.fail("boom")
+    assert proxy.pid() == pid
+
+
+def test_stream(proxy):
+    assert list(proxy.count(4)) == [0, 1, 2, 3]
+    assert list(proxy.count(0)) == []
+    # Worker is back in the pool once the stream is consumed
+    assert proxy.add(1, 1) == 2
+
+
+def test_abandoned_stream_replaces_worker_on_next_call(proxy):
+    pid = proxy.pid()
+    stream = proxy.count(10)
+    assert next(stream) == 0
+
+    del stream
+    gc.collect()
+
+    # The dirty worker is swapped for a fresh one by the caller, not the finalizer
+    assert proxy.add(2, 2) == 4
+    assert proxy.pid() != pid
+
+
+def test_checkout_times_out_while_stream_held(proxy, monkeypatch):
+    monkeypatch.setattr(isolation, "CHECKOUT_TIMEOUT", 0.3)
+    stream = proxy.count(10)
+    assert next(stream) == 0
+
+    with pytest.raises(PluginWorkerError, match="No idle worker"):
+        proxy.add(1, 2)
+
+    stream.close()
+    assert proxy.add(1, 2) == 3
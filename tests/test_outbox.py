@@ -0,0 +1,138 @@
+"""
+Outbox tests
+Delivery, retry and coalescing against a local stub server
+"""
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+import api_client
+import outbox
+from outbox import Outbox
+
+
+class StubServer:
+    """Records POST bodies; answers with queued status codes, then 200"""
+
+    def __init__(self):
+        self.statuses = []
+        self.requests = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.requests.append({
+                    "path": self.path,
+                    "body": json.loads(body) if body else None,
+                    "idempotency_key": self.headers.get("Idempotency-Key")
+                })
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                data = json.dumps({"ok": status < 400}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    stub = StubServer()
+    monkeypatch.setattr(api_client, "_client", api_client.ApiClient(max_retries=0))
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def box(tmp_path):
+    return Outbox(str(tmp_path / "outbox.db"))
+
+
+def make_due(box):
+    """Skip the backoff delay of rescheduled items"""
+    conn = sqlite3.connect(box.db_path)
+    conn.execute("UPDATE outbox SET next_attempt_at = 0")
+    conn.commit()
+    conn.close()
+
+
+def test_delivery_notifies_and_removes_item(server, box):
+    delivered = []
+    outbox.subscribe("test.deliver", lambda payload, response: delivered.append((payload, response.status_code)))
+
+    box.enqueue("test.deliver", "POST", f"{server.url}/deliver", {"n": 1})
+    assert box.drain() == 1
+
+    assert server.requests[0]["body"] == {"n": 1}
+    assert server.requests[0]["idempotency_key"]
+    assert delivered == [({"n": 1}, 200)]
+    assert box.get_items() == []
+
+
+def test_server_error_is_retried_with_same_idempotency_key(server, box):
+    server.statuses = [503]
+    box.enqueue("test.retry", "POST", f"{server.url}/retry", {"n": 1})
+
+    assert box.drain() == 0
+    item, = box.get_items()
+    assert item["status"] == "pending"
+    assert item["attempts"] == 1
+    assert item["last_error"] == "HTTP 503"
+
+    # Not due yet: nothing is sent
+    assert box.drain() == 0
+    assert len(server.requests) == 1
+
+    make_due(box)
+    assert box.drain() == 1
+    assert box.get_items() == []
+    first, second = server.requests
+    assert first["idempotency_key"] == second["idempotency_key"]
+
+
+def test_coalesced_items_send_only_the_latest(server, box):
+    first_id = box.enqueue("test.coalesce", "POST", f"{server.url}/beat", {"n": 1}, coalesce_key="beat")
+    second_id = box.enqueue("test.coalesce", "POST", f"{server.url}/beat", {"n": 2}, coalesce_key="beat")
+
+    assert first_id == second_id
+    assert len(box.get_items()) == 1
+
+    assert box.drain() == 1
+    assert [r["body"] for r in server.requests] == [{"n": 2}]
+
+
+def test_rejected_items_kept_or_discarded_by_kind(server, box):
+    outbox.configure("test.secret", keep_failed=False)
+    server.statuses = [400, 400]
+
+    box.enqueue("test.plain", "POST", f"{server.url}/plain", {"n": 1})
+    box.enqueue("test.secret", "POST", f"{server.url}/secret", {"key": "s3cret"})
+    assert box.drain() == 0
+
+    item, = box.get_items()
+    assert item["kind"] == "test.plain"
+    assert item["status"] == "failed"
+    assert item["last_error"] == "HTTP 400"
+
+
+def test_payloads_are_not_stored_in_plain_text(box):
+    box.enqueue("test.secret", "POST", "http://127.0.0.1:9/x", {"license_key": "LICENSE-SECRET"})
+    assert b"LICENSE-SECRET" not in box.db_path.read_bytes()
@@ -0,0 +1,72 @@
+"""
+Video downloader prefetch tests
+Failed extractions are remembered instead of resubmitted
+"""
+import threading
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("yt_dlp")
+
+from modules.video_downloader.downloader import VideoDownloader
+
+URL = "https://example.com/watch?v=1"
+
+
+@pytest.fixture
+def downloader(monkeypatch):
+    # Class-level state is shared by every instance; start each test clean
+    monkeypatch.setattr(VideoDownloader, "_info_cache", OrderedDict())
+    monkeypatch.setattr(VideoDownloader, "_inflight", {})
+    monkeypatch.setattr(VideoDownloader, "_latest_request", {})
+    monkeypatch.setattr(VideoDownloader, "_failed", OrderedDict())
+    monkeypatch.setattr(VideoDownloader, "_info_lock", threading.Lock())
+    monkeypatch.setattr(VideoDownloader, "PREFETCH_DEBOUNCE", 0)
+    return VideoDownloader()
+
+
+def test_failed_prefetch_is_attempted_once(downloader, monkeypatch):
+    attempts = []
+
+    def failing_extract(url):
+        attempts.append(url)
+        raise RuntimeError("Unsupported URL")
+
+    monkeypatch.setattr(downloader, "_extract_info", failing_extract)
+
+    future = downloader.prefetch_info(URL, key="session")
+    assert future.result(timeout=5) is None
+    assert downloader.get_prefetch(URL) is None
+    assert downloader.get_prefetch_error(URL) == "Unsupported URL"
+
+    # Every rerun calls prefetch_info again; nothing new is submitted
+    for _ in range(3):
+        assert downloader.prefetch_info(URL, key="session") is None
+    assert attempts == [URL]
+
+
+def test_failure_expires_after_ttl(downloader, monkeypatch):
+    monkeypatch.setattr(VideoDownloader, "FAILURE_TTL", 0)
+    attempts = []
+
+    def failing_extract(url):
+        attempts.append(url)
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(downloader, "_extract_info", failing_extract)
+
+    downloader.prefetch_info(URL, key="session").result(timeout=5)
+    downloader.prefetch_info(URL, key="session").result(timeout=5)
+    assert attempts == [URL, URL]
+
+
+def test_success_clears_failure(downloader):
+    with downloader._info_lock:
+        downloader._failed[URL] = ("offline", 0.0)
+    downloader.FAILURE_TTL = float("inf")
+    assert downloader.get_prefetch_error(URL) == "offline"
+
+    downloader._cache_info(URL, {"title": "ok"})
+    assert downloader.get_prefetch_error(URL) is None
+    assert downloader.prefetch_info(URL, key="session") is None
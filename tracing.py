@@ -0,0 +1,143 @@
+"""
+AIGEM2 Tracing
+Timed span trees per rerun, plus process-wide totals for Prometheus export
+"""
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Dict, Optional, Any
+
+# Active span per thread (each Streamlit session reruns on its own thread)
+_local = threading.local()
+
+_totals: Dict[str, List[float]] = {}
+_totals_lock = threading.Lock()
+
+
+class Span:
+    """One timed block and the spans opened inside it"""
+
+    __slots__ = ("name", "attrs", "start", "duration_ms", "children")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration_ms: Optional[float] = None
+        self.children: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "attrs": self.attrs,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+    def walk(self, depth: int = 0) -> Iterator[tuple]:
+        """(depth, span) pairs, depth first"""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+def active() -> bool:
+    """Whether a trace is open on this thread"""
+    return getattr(_local, "current", None) is not None
+
+
+@contextmanager
+def trace(name: str, **attrs):
+    """Start a new span tree on this thread; yields the root span"""
+    root = Span(name, attrs)
+    previous = getattr(_local, "current", None)
+    _local.current = root
+    start = time.perf_counter()
+    try:
+        yield root
+    finally:
+        root.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _local.current = previous
+        _add_total(name, root.duration_ms)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block as a child of the active span (no-op outside a trace)"""
+    parent = getattr(_local, "current", None)
+    if parent is None:
+        yield None
+        return
+
+    current = Span(name, attrs)
+    parent.children.append(current)
+    _local.current = current
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _local.current = parent
+        _add_total(name, current.duration_ms)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator form of span(); defaults to Class.method"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "current", None) is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _add_total(name: str, duration_ms: float):
+    with _totals_lock:
+        totals = _totals.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += duration_ms / 1000
+        totals[2] = max(totals[2], duration_ms / 1000)
+
+
+def export_prometheus() -> str:
+    """Process-wide span totals in Prometheus text exposition format"""
+    with _totals_lock:
+        totals = {name: list(values) for name, values in _totals.items()}
+
+    lines = [
+        "# HELP aigem2_span_seconds Time spent in traced spans",
+        "# TYPE aigem2_span_seconds summary"
+    ]
+    for name, (count, total, _) in sorted(totals.items()):
+        label = _escape_label(name)
+        lines.append(f'aigem2_span_seconds_count{{span="{label}"}} {count}')
+        lines.append(f'aigem2_span_seconds_sum{{span="{label}"}} {total:.6f}')
+
+    lines.append("# HELP aigem2_span_max_seconds Slowest occurrence of each span")
+    lines.append("# TYPE aigem2_span_max_seconds gauge")
+    for name, (_, _, maximum) in sorted(totals.items()):
+        lines.append(f'aigem2_span_max_seconds{{span="{_escape_label(name)}"}} {maximum:.6f}')
+
+    return "\n".join(lines) + "\n"
+
+
+def export_json(traces: List[Span]) -> str:
+    """Span trees as JSON"""
+    return json.dumps({
+        "exported_at": time.time(),
+        "traces": [root.to_dict() for root in traces]
+    }, indent=2, default=str)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -12,16 +12,21 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from config import AppConfig
 from ui.theme import apply_theme, toggle_theme
-from i18n.loader import get_text, set_language
+from ui.perf import measure_interaction, measure_payload, trace_rerun, recent_traces
+from ui.session_state import sample_session_size
+from i18n.loader import get_text
 from modules.plugin_manager import PluginManager
+from entitlements import get_entitlements
+from tracing import span, traced
 
 
 class MainApp:
     """Main application controller""" 
     
-def __init__(self, config: AppConfig, license_tier: str):
+    def __init__(self, config: AppConfig, license_tier: str):
         self.config = config
         self.license_tier = license_tier
+        self.entitlements = get_entitlements(config, license_tier)
         self.plugin_manager = PluginManager(config, license_tier)
         
         # Initialize session state
@@ -32,21 +37,42 @@ def __init__(self, config: AppConfig, license_tier: str):
         if 'language' not in st.session_state:
             st.session_state.language = 'en'
     
-def run(self):
+    def run(self):
         """Main application loop"""        
-        # Apply theme
-        apply_theme(st.session_state.theme)
+        with measure_interaction("full_rerun"), measure_payload("full_rerun"), trace_rerun("MainApp.run"):
+            # Apply theme
+            with span("apply_theme"):
+                apply_theme(st.session_state.theme)
+            
+            # Render header
+            self._render_header()
+            
+            # Render sidebar
+            selected_page = self._render_sidebar()
+            
+            # Render main content
+            self._render_content(selected_page)
         
-        # Render header
-        self._render_header()
+        # Pre-import reachable plugins once the page has been sent
+        self.plugin_manager.warm_up()
         
-        # Render sidebar
-        selected_page = self._render_sidebar()
+        sample_session_size()
+        
+        if self.config.TRACE_OVERLAY:
+            self._render_trace_overlay()
+    
+    def _render_trace_overlay(self):
+        """Span tree of the last rerun, at the bottom of the sidebar"""
+        traces = recent_traces()
+        if not traces:
+            return
         
-        # Render main content
-        self._render_content(selected_page)
+        from ui.components.trace_view import render_span_tree
+        with st.sidebar.expander(f"⏱️ Last rerun: {traces[-1].duration_ms:.0f} ms"):
+            render_span_tree(traces[-1])
     
-def _render_header(self):
+    @traced()
+    def _render_header(self):
         """Render top header bar"""        
         col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
         
@@ -71,7 +97,6 @@ def _render_header(self):
             )
             if lang != st.session_state.language:
                 st.session_state.language = lang
-                set_language(lang)
                 st.rerun()
         
         with col4:
@@ -81,7 +106,8 @@ def _render_header(self):
         
         st.divider()
     
-def _render_sidebar(self) -> str:
+    @traced()
+    def _render_sidebar(self) -> str:
         """Render sidebar navigation"""        
         with st.sidebar:
             st.markdown("## " + get_text("navigation"))
@@ -93,15 +119,15 @@ def _render_sidebar(self) -> str:
             }
             
             # Conditional modules based on tier
-            if self._check_tier_access("STARTER"):
+            if self.entitlements.tier_at_least("STARTER"):
                 pages["video_downloader"] = {"icon": "🎥", "label": get_text("video_downloader"), "tier": "STARTER"}
                 pages["transcription"] = {"icon": "🎙️", "label": get_text("transcription"), "tier": "STARTER"}
             
-            if self._check_tier_access("PRO"):
+            if self.entitlements.tier_at_least("PRO"):
                 pages["ai_assistant"] = {"icon": "🤖", "label": get_text("ai_assistant"), "tier": "PRO"}
                 pages["screen_recorder"] = {"icon": "🖥️", "label": get_text("screen_recorder"), "tier": "PRO"}
             
-            if self._check_tier_access("PREMIUM"):
+            if self.entitlements.tier_at_least("PREMIUM"):
                 pages["content_repurposer"] = {"icon": "✍️", "label": get_text("content_repurposer"), "tier": "PREMIUM"}
                 pages["translation"] = {"icon": "🌍", "label": get_text("translation"), "tier": "PREMIUM"}
             
@@ -124,10 +150,18 @@ def _render_sidebar(self) -> str:
             if st.button("💳 " + get_text("tier_management"), key="nav_tier", use_container_width=True):
                 selected = "tier_management"
             
+            if self.config.ADMIN_MODE:
+                if st.button("🩺 Diagnostics", key="nav_diagnostics", use_container_width=True):
+                    selected = "diagnostics"
+            
             return selected if selected else st.session_state.current_page
     
-def _render_content(self, page: str):
+    @traced()
+    def _render_content(self, page: str):
         """Render main content area"""        
+        # Widget interactions rerun the same page; only a page change is a visit
+        new_visit = st.session_state.get("visited_page") != page
+        st.session_state.visited_page = page
         st.session_state.current_page = page
         
         if page == "dashboard":
@@ -142,11 +176,15 @@ def _render_content(self, page: str):
             from ui.pages.tier_management import render_tier_management
             render_tier_management(self.license_tier, self.config)
         
+        elif page == "diagnostics" and self.config.ADMIN_MODE:
+            from ui.pages.diagnostics import render_diagnostics
+            render_diagnostics(self.config)
+        
         else:
             # Load plugin module
-            self._load_plugin(page)
+            self._load_plugin(page, new_visit)
     
-def _load_plugin(self, plugin_id: str):
+    def _load_plugin(self, plugin_id: str, new_visit: bool = True):
         """Load and render plugin module"""        
         # Check tier access
         plugin_meta = self.plugin_manager.get_plugin_metadata(plugin_id)
@@ -155,7 +193,7 @@ def _load_plugin(self, plugin_id: str):
             st.error(f"Plugin '{plugin_id}' not found")
             return
         
-        if not self._check_tier_access(plugin_meta.get("tier_required", "FREE")):
+        if not self.entitlements.tier_at_least(plugin_meta.get("tier_required", "FREE")):
             st.warning(get_text("upgrade_required"))
             st.info(f"This feature requires {plugin_meta['tier_required']} tier or higher")
             
@@ -164,22 +202,15 @@ def _load_plugin(self, plugin_id: str):
                 st.rerun()
             return
         
+        if new_visit:
+            self.plugin_manager.record_navigation(plugin_id)
+        
         # Load plugin with spinner
         with st.spinner(get_text("loading_module")):
             plugin = self.plugin_manager.load_plugin(plugin_id)
             
             if plugin:
-                plugin.render_ui()
+                self.plugin_manager.render_plugin(plugin_id, plugin)
             else:
                 st.error(get_text("module_load_failed"))
-    
-def _check_tier_access(self, required_tier: str) -> bool:
-        """Check if current tier has access to required tier"""
-        tier_hierarchy = ["FREE", "STARTER", "PRO", "PREMIUM"]
-        
-        try:
-            current_index = tier_hierarchy.index(self.license_tier)
-            required_index = tier_hierarchy.index(required_tier)
-            return current_index >= required_index
-        except ValueError:
-            return False
+
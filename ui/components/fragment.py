@@ -0,0 +1,31 @@
+"""
+Fragment Helpers
+Partial reruns via st.fragment, degrading to full reruns on older Streamlit
+"""
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+FRAGMENTS_SUPPORTED = _fragment is not None
+
+
+def fragment(func=None, *, run_every=None):
+    """st.fragment when available, otherwise a no-op decorator"""
+    def decorate(f):
+        if _fragment is None:
+            return f
+        return _fragment(f, run_every=run_every) if run_every else _fragment(f)
+
+    return decorate(func) if func is not None else decorate
+
+
+def rerun_fragment():
+    """Rerun only the current fragment (full rerun if fragments are unavailable)"""
+    if FRAGMENTS_SUPPORTED:
+        try:
+            st.rerun(scope="fragment")
+        except (TypeError, StreamlitAPIException):
+            # No scoped reruns in this version, or not inside a fragment run
+            pass
+    st.rerun()
@@ -0,0 +1,20 @@
+"""
+Trace View Component
+Renders a rerun's span tree as an indented table
+"""
+import streamlit as st
+
+
+def render_span_tree(root):
+    """Render one span tree (slowest branches are easy to spot by the share column)"""
+    total = root.duration_ms or 0
+    rows = []
+    for depth, node in root.walk():
+        duration = node.duration_ms or 0
+        rows.append({
+            "span": " " * depth + node.name,
+            "ms": duration,
+            "share": f"{duration / total:.0%}" if total else "",
+            "attrs": ", ".join(f"{k}={v}" for k, v in node.attrs.items())
+        })
+    st.dataframe(rows, use_container_width=True, hide_index=True)
@@ -4,12 +4,15 @@ Shows overview, recent activity, quick actions
 """
 import streamlit as st
 from config import AppConfig
+from entitlements import get_entitlements, get_usage_ledger, VIDEO_DOWNLOADS
 
 def render_dashboard(tier: str, config: AppConfig):
     """Render dashboard page"""
     
     st.title("🏠 Dashboard")
     
+    entitlements = get_entitlements(config, tier)
+    
     # Welcome message
     st.markdown(f"### Welcome to AIGEM2!")
     st.markdown(f"Current tier: **{tier}**")
@@ -23,7 +26,11 @@ def render_dashboard(tier: str, config: AppConfig):
         st.metric("Total Notes", "0", help="Notes in Knowledge Base")
     
     with col2:
-        st.metric("Videos Downloaded", "0", help="Total videos downloaded")
+        st.metric(
+            "Videos Downloaded",
+            get_usage_ledger().month_total(VIDEO_DOWNLOADS),
+            help="Videos downloaded this month"
+        )
     
     with col3:
         st.metric("Storage Used", "0 MB", help="Local storage usage")
@@ -41,7 +48,7 @@ def render_dashboard(tier: str, config: AppConfig):
             st.rerun()
     
     with col2:
-        if tier != "FREE":
+        if entitlements.has("video_download"):
             if st.button("🎥 Download Video", use_container_width=True):
                 st.session_state.current_page = "video_downloader"
                 st.rerun()
@@ -49,7 +56,7 @@ def render_dashboard(tier: str, config: AppConfig):
             st.button("🎥 Download Video (STARTER+)", use_container_width=True, disabled=True)
     
     with col3:
-        if tier in ["PRO", "PREMIUM"]:
+        if entitlements.tier_at_least("PRO"):
             if st.button("🤖 AI Assistant", use_container_width=True):
                 st.session_state.current_page = "ai_assistant"
                 st.rerun()
@@ -59,7 +66,7 @@ def render_dashboard(tier: str, config: AppConfig):
     st.divider()
     
     # Tier comparison
-    if tier == "FREE":
+    if not entitlements.tier_at_least("STARTER"):
         st.info("💡 Upgrade to unlock more features!")
         
         tier_config = config.get_tier_config("STARTER")
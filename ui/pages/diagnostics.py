@@ -0,0 +1,177 @@
+"""
+Diagnostics Page
+Admin-only performance data (enable with AIGEM2_ADMIN=1)
+"""
+import streamlit as st
+from config import AppConfig
+from api_client import get_api_client
+from outbox import get_outbox
+from modules.profiling import plugin_profiler
+from modules.runtime import get_plugin_runtime
+from ui.perf import interaction_summary, payload_summary, recent_traces
+from i18n.loader import catalog
+from ui.session_state import session_memory_report, record_session_size, all_session_sizes, SESSION_BUDGET_KB
+from ui.components.trace_view import render_span_tree
+from tracing import export_prometheus, export_json
+
+def render_diagnostics(config: AppConfig):
+    """Render diagnostics page"""
+    
+    st.title("🩺 Diagnostics")
+    
+    # Plugin timings
+    st.markdown("### Plugin Performance")
+    
+    summary = plugin_profiler.summary()
+    
+    if summary:
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+    else:
+        st.info("No plugin activity recorded yet")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.download_button(
+            "📤 Export JSON",
+            data=plugin_profiler.export_json(),
+            file_name="plugin_profile.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    
+    with col2:
+        if st.button("🗑️ Clear Samples", use_container_width=True):
+            plugin_profiler.clear()
+            st.rerun()
+    
+    with st.expander("Recent samples"):
+        st.dataframe(list(reversed(plugin_profiler.samples()[-200:])), use_container_width=True, hide_index=True)
+    
+    st.divider()
+    
+    # Server time per interaction in this session
+    st.markdown("### Interaction Timings")
+    st.caption("Full reruns vs fragment-only reruns for this session")
+    
+    interactions = interaction_summary()
+    
+    if interactions:
+        st.dataframe(interactions, use_container_width=True, hide_index=True)
+    else:
+        st.info("No interactions recorded yet")
+    
+    payloads = payload_summary()
+    
+    if payloads:
+        st.caption("Bytes sent to the browser per rerun")
+        st.dataframe(payloads, use_container_width=True, hide_index=True)
+    
+    st.divider()
+    
+    # Per-session state size
+    st.markdown("### Session Memory")
+    
+    report = session_memory_report()
+    record_session_size(report)
+    sessions = all_session_sizes()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("This session", f"{sum(report.values()) / 1024:.1f} KB", help=f"Budget {SESSION_BUDGET_KB} KB")
+    with col2:
+        st.metric("Active sessions", len(sessions))
+    with col3:
+        st.metric("All sessions", f"{sum(s['bytes'] for s in sessions.values()) / 1024:.1f} KB")
+    
+    with st.expander("Largest session_state keys"):
+        st.dataframe(
+            [{"key": key, "kb": round(size / 1024, 2)} for key, size in report.items()],
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    st.divider()
+    
+    # Server calls through the pooled client
+    st.markdown("### Server API")
+    
+    client = get_api_client()
+    api_summary = client.metrics_summary()
+    
+    for host, state in client.breaker_states().items():
+        st.caption(f"{host}: circuit {state}")
+    
+    if api_summary:
+        st.dataframe(api_summary, use_container_width=True, hide_index=True)
+    else:
+        st.info("No server calls yet")
+    
+    queued = get_outbox().get_items()
+    if queued:
+        with st.expander(f"Outbox ({len(queued)} waiting)"):
+            st.dataframe(
+                [{k: item[k] for k in ("kind", "status", "attempts", "last_error")} for item in queued],
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    st.divider()
+    
+    # Translation coverage
+    st.markdown("### Translations")
+    
+    i18n_report = catalog.missing_report()
+    
+    for language, keys in i18n_report["untranslated"].items():
+        st.warning(f"{language}: {len(keys)} key(s) fall back to another language: {', '.join(keys)}")
+    if i18n_report["unknown"]:
+        st.error(f"Keys missing from every catalog: {', '.join(i18n_report['unknown'])}")
+    if not i18n_report["untranslated"] and not i18n_report["unknown"]:
+        st.success("All keys translated")
+    
+    st.divider()
+    
+    # Span trees of recent reruns (this session) and process-wide span totals
+    st.markdown("### Rerun Traces")
+    
+    traces = recent_traces()
+    if traces:
+        last = traces[-1]
+        st.caption(f"Last traced rerun: {last.name}, {last.duration_ms:.1f} ms ({len(traces)} kept)")
+        render_span_tree(last)
+    else:
+        st.info("No traced reruns yet")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Prometheus metrics",
+            data=export_prometheus(),
+            file_name="aigem2_spans.prom",
+            mime="text/plain"
+        )
+    with col2:
+        st.download_button(
+            "Traces (JSON)",
+            data=export_json(traces),
+            file_name="aigem2_traces.json",
+            mime="application/json",
+            disabled=not traces
+        )
+    
+    st.divider()
+    
+    # Shared plugin services
+    st.markdown("### Loaded Plugin Services")
+    
+    services = get_plugin_runtime().stats()
+    
+    if services:
+        st.dataframe(
+            [{"plugin_id": plugin_id, **stats} for plugin_id, stats in services.items()],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No plugin services loaded")
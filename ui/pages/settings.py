@@ -59,7 +59,13 @@ def render_settings(config: AppConfig):
     
     with col2:
         if st.button("🗑️ Clear Cache"):
-            st.success("Cache cleared!")
+            from services import get_container
+            with st.spinner("Refreshing configuration..."):
+                refreshed = get_container().refresh_config()
+            if refreshed:
+                st.success("Cache cleared!")
+            else:
+                st.warning("Couldn't refresh from the server, keeping cached configuration")
     
     st.divider()
     
@@ -4,6 +4,8 @@ License activation, upgrade, quota monitoring
 """
 import streamlit as st
 from config import AppConfig
+from entitlements import get_entitlements, get_usage_ledger, MONTHLY_LIMITS
+from modules.registry import TIER_HIERARCHY
 
 def render_tier_management(tier: str, config: AppConfig):
     """Render tier management page"""
@@ -18,11 +20,29 @@ def render_tier_management(tier: str, config: AppConfig):
     
     tier_config = config.get_tier_config(tier)
     
-    if tier == "FREE":
+    if tier not in TIER_HIERARCHY:
+        st.warning("No active license: features and quotas stay locked until a license is activated.")
+    elif tier == "FREE":
         st.info("You're currently on the FREE tier with limited features.")
     else:
         st.success(f"You're on the {tier} tier. Thank you for your support! 🙏")
     
+    # Monthly quotas
+    entitlements = get_entitlements(config, tier)
+    ledger = get_usage_ledger()
+    
+    cols = st.columns(len(MONTHLY_LIMITS))
+    for idx, (metric, limit_key) in enumerate(MONTHLY_LIMITS.items()):
+        with cols[idx]:
+            limit = entitlements.limit(limit_key)
+            used = ledger.month_total(metric)
+            label = metric.replace("_", " ").title() + " this month"
+            if limit is None:
+                st.metric(label, f"{used:,}", help="Unlimited")
+            else:
+                st.metric(label, f"{used:,} / {limit:,}")
+                st.progress(min(used / limit, 1.0) if limit else 1.0)
+    
     st.divider()
     
     # Tier comparison
@@ -90,10 +110,20 @@ def render_tier_management(tier: str, config: AppConfig):
             if st.button("Activate", type="primary"):
                 if license_key:
                     with st.spinner("Activating license..."):
-                        import time
-                        time.sleep(2)
-                        st.success("License activated successfully!")
+                        from licensing.client.license_validator import LicenseValidator
+                        result = LicenseValidator().activate_license(license_key)
+                    
+                    if result["success"]:
+                        from services import get_container
+                        get_container().invalidate_license()
+                        del st.session_state.show_activation
+                        st.success(result["message"])
                         st.balloons()
+                        st.rerun()
+                    elif result.get("queued"):
+                        st.info(result["message"])
+                    else:
+                        st.error(result["message"])
                 else:
                     st.error("Please enter a license key")
         
@@ -0,0 +1,135 @@
+"""
+Interaction Timing
+Server time, websocket payload and span traces per interaction (full rerun vs fragment rerun), per session
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Any
+
+import streamlit as st
+
+from tracing import trace, span, active
+
+SESSION_KEY = "_interaction_timings"
+PAYLOAD_KEY = "_payload_bytes"
+TRACE_KEY = "_traces"
+MAX_SAMPLES = 200
+MAX_TRACES = 50
+
+
+@contextmanager
+def measure_interaction(region: str):
+    """Record server time spent rendering a region"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_interaction(region, (time.perf_counter() - start) * 1000)
+
+
+def record_interaction(region: str, elapsed_ms: float):
+    """Append a timing sample to this session's ring buffer"""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = deque(maxlen=MAX_SAMPLES)
+    st.session_state[SESSION_KEY].append({
+        "region": region,
+        "ms": round(elapsed_ms, 2),
+        "timestamp": time.time()
+    })
+
+
+@contextmanager
+def measure_payload(region: str):
+    """Count bytes of the messages Streamlit sends to the browser while rendering a region"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        ctx = None
+
+    if ctx is None or not hasattr(ctx, "enqueue"):
+        yield
+        return
+
+    counter = {"bytes": 0, "messages": 0}
+    original = ctx.enqueue
+
+    def counting_enqueue(msg):
+        counter["bytes"] += msg.ByteSize()
+        counter["messages"] += 1
+        return original(msg)
+
+    ctx.enqueue = counting_enqueue
+    try:
+        yield
+    finally:
+        ctx.enqueue = original
+        if PAYLOAD_KEY not in st.session_state:
+            st.session_state[PAYLOAD_KEY] = deque(maxlen=MAX_SAMPLES)
+        st.session_state[PAYLOAD_KEY].append({
+            "region": region,
+            "bytes": counter["bytes"],
+            "messages": counter["messages"],
+            "timestamp": time.time()
+        })
+
+
+def payload_summary() -> List[Dict[str, Any]]:
+    """Messages and bytes sent per rerun, by region, for this session"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for sample in st.session_state.get(PAYLOAD_KEY, []):
+        groups.setdefault(sample["region"], []).append(sample)
+
+    return [
+        {
+            "region": region,
+            "reruns": len(samples),
+            "last_bytes": samples[-1]["bytes"],
+            "mean_bytes": round(sum(s["bytes"] for s in samples) / len(samples)),
+            "mean_messages": round(sum(s["messages"] for s in samples) / len(samples), 1)
+        }
+        for region, samples in sorted(groups.items())
+    ]
+
+
+@contextmanager
+def trace_rerun(region: str):
+    """Collect the spans opened while rendering a region into this session's trace buffer"""
+    if active():
+        # A fragment rendered as part of a full rerun is just a branch of that trace
+        with span(region) as node:
+            yield node
+        return
+
+    with trace(region) as root:
+        try:
+            yield root
+        finally:
+            if TRACE_KEY not in st.session_state:
+                st.session_state[TRACE_KEY] = deque(maxlen=MAX_TRACES)
+            st.session_state[TRACE_KEY].append(root)
+
+
+def recent_traces() -> List[Any]:
+    """This session's span trees, oldest first"""
+    return list(st.session_state.get(TRACE_KEY, []))
+
+
+def interaction_summary() -> List[Dict[str, Any]]:
+    """Count, mean and p95 server time per region for this session"""
+    groups: Dict[str, List[float]] = {}
+    for sample in st.session_state.get(SESSION_KEY, []):
+        groups.setdefault(sample["region"], []).append(sample["ms"])
+
+    rows = []
+    for region, values in sorted(groups.items()):
+        ordered = sorted(values)
+        rows.append({
+            "region": region,
+            "count": len(values),
+            "last_ms": values[-1],
+            "mean_ms": round(sum(values) / len(values), 2),
+            "p95_ms": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        })
+    return rows
@@ -0,0 +1,138 @@
+"""
+Session State Policy
+Keep per-session state small: IDs and cursors instead of hydrated rows
+"""
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Optional, Any
+
+import streamlit as st
+
+MAX_STORED_IDS = 500
+SESSION_BUDGET_KB = 256
+SIZE_REPORT_TTL = 3600
+# Full reruns between size samples (the estimate walks all of session_state)
+SIZE_SAMPLE_EVERY = 25
+
+_SAMPLE_COUNTER_KEY = "_size_sample_reruns"
+_BUDGET_WARNED_KEY = "_size_budget_warned"
+
+logger = logging.getLogger(__name__)
+
+# Types walked recursively by the estimator; anything else is counted shallowly
+_CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+
+_session_sizes: Dict[str, Dict[str, Any]] = {}
+_session_sizes_lock = threading.Lock()
+
+
+def store_ids(key: str, ids: List[int]):
+    """Store a capped list of row IDs under key, plus the uncapped count"""
+    st.session_state[key] = tuple(ids[:MAX_STORED_IDS])
+    st.session_state[f"{key}_total"] = len(ids)
+
+
+def get_ids(key: str) -> Optional[tuple]:
+    """Stored IDs, or None if nothing was stored"""
+    return st.session_state.get(key)
+
+
+def get_total(key: str) -> int:
+    """How many IDs there were before capping (may exceed len(get_ids(key)))"""
+    return st.session_state.get(f"{key}_total", len(st.session_state.get(key) or ()))
+
+
+def get_cursor(key: str) -> int:
+    """Current page offset for a list"""
+    return st.session_state.get(f"{key}_cursor", 0)
+
+
+def set_cursor(key: str, offset: int):
+    st.session_state[f"{key}_cursor"] = max(offset, 0)
+
+
+def clear(*keys: str):
+    """Drop stored IDs and their cursors"""
+    for key in keys:
+        st.session_state.pop(key, None)
+        st.session_state.pop(f"{key}_total", None)
+        st.session_state.pop(f"{key}_cursor", None)
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate bytes held by a plain-data value
+
+    Builtin containers are walked; other objects (apps, services, handles)
+    are counted shallowly because they are shared or owned elsewhere.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, _CONTAINERS):
+        size += sum(estimate_size(item, _seen) for item in value)
+    return size
+
+
+def session_memory_report() -> Dict[str, int]:
+    """Estimated bytes per session_state key, largest first"""
+    sizes = {}
+    for key in list(st.session_state.keys()):
+        try:
+            sizes[str(key)] = estimate_size(st.session_state[key])
+        except KeyError:
+            continue
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def sample_session_size():
+    """Record the session size on the first full rerun and every SIZE_SAMPLE_EVERY after"""
+    reruns = st.session_state.get(_SAMPLE_COUNTER_KEY, 0)
+    st.session_state[_SAMPLE_COUNTER_KEY] = reruns + 1
+    if reruns % SIZE_SAMPLE_EVERY == 0:
+        record_session_size()
+
+
+def record_session_size(report: Optional[Dict[str, int]] = None) -> int:
+    """Estimate this session's state and publish it for the process-wide view
+
+    Pass a session_memory_report() already computed to avoid a second walk.
+    """
+    if report is None:
+        report = session_memory_report()
+    total = sum(report.values())
+    if total > SESSION_BUDGET_KB * 1024 and not st.session_state.get(_BUDGET_WARNED_KEY):
+        st.session_state[_BUDGET_WARNED_KEY] = True
+        logger.warning("Session state is %d KB (budget %d KB)", total // 1024, SESSION_BUDGET_KB)
+
+    session_id = _session_id()
+    if session_id:
+        now = time.time()
+        with _session_sizes_lock:
+            _session_sizes[session_id] = {"bytes": total, "updated_at": now}
+            for stale in [s for s, v in _session_sizes.items() if now - v["updated_at"] > SIZE_REPORT_TTL]:
+                del _session_sizes[stale]
+    return total
+
+
+def all_session_sizes() -> Dict[str, Dict[str, Any]]:
+    """Last reported state size of every recently active session"""
+    with _session_sizes_lock:
+        return {session_id: dict(info) for session_id, info in _session_sizes.items()}
+
+
+def _session_id() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
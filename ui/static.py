@@ -0,0 +1,14 @@
+"""
+Static Assets
+Files under ./static are served by Streamlit at /app/static
+"""
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+STATIC_DIR = ROOT_DIR / "static"
+STATIC_URL = "app/static"
+
+
+def static_url(relative_path: str) -> str:
+    """Return the browser URL for a file path relative to STATIC_DIR"""
+    return f"{STATIC_URL}/{relative_path}"